@@ -221,6 +221,7 @@ try {
     Copy-Item (Join-Path $templatesDir "opportunity_alert_template.py") (Join-Path $scriptsPath "opportunity_alert.py")
     Copy-Item (Join-Path $templatesDir "health_check_template.py") (Join-Path $scriptsPath "health_check.py")
     Copy-Item (Join-Path $templatesDir "update_settings_template.py") (Join-Path $scriptsPath "update_settings.py")
+    Copy-Item (Join-Path $templatesDir "job_scanner") $scriptsPath -Recurse -Force
     
     Write-Success "Scripts created"
     
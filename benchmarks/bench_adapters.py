@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+ATS Adapter Benchmark
+Replays recorded Greenhouse, Lever, Ashby and Workday API responses from
+benchmarks/fixtures/ats through the job_scanner adapters (no network), checks
+the jobs they decode, then compares reading a large board through the API
+against scraping the same jobs from HTML
+
+Usage: python benchmarks/bench_adapters.py [postings]
+"""
+
+import json
+import sys
+import timeit
+from pathlib import Path
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "ats"
+sys.path.insert(0, str(TEMPLATES_DIR))
+
+from job_scanner import ats, extract, scanner
+
+KEYWORDS = ["Analyst", "Engineer", "Informatics", "Developer", "Epic"]
+NEGATIVE_KEYWORDS = ["nurse", "physician", "intern"]
+
+# Career site URL, the API requests the adapter should make, and the job
+# URLs it should report
+CASES = [
+    ("https://boards.greenhouse.io/examplehealth",
+     {"https://boards-api.greenhouse.io/v1/boards/examplehealth/jobs": "greenhouse.json"},
+     ["https://boards.greenhouse.io/examplehealth/jobs/4012345",
+      "https://boards.greenhouse.io/examplehealth/jobs/4012346"]),
+    ("https://jobs.lever.co/examplecare",
+     {"https://api.lever.co/v0/postings/examplecare?mode=json&skip=0&limit=100": "lever_page1.json"},
+     ["https://jobs.lever.co/examplecare/a1b2"]),
+    ("https://jobs.ashbyhq.com/examplelabs",
+     {"https://api.ashbyhq.com/posting-api/job-board/examplelabs": "ashby.json"},
+     ["https://jobs.ashbyhq.com/examplelabs/11111111-aaaa"]),
+    ("https://example.wd5.myworkdayjobs.com/en-US/Careers",
+     {"https://example.wd5.myworkdayjobs.com/wday/cxs/example/Careers/jobs#0": "workday_page1.json",
+      "https://example.wd5.myworkdayjobs.com/wday/cxs/example/Careers/jobs#20": "workday_page2.json"},
+     ["https://example.wd5.myworkdayjobs.com/en-US/Careers/job/Portland-OR/Epic-Analyst-II_R1001",
+      "https://example.wd5.myworkdayjobs.com/en-US/Careers/job/Remote/Clinical-Informatics-Analyst_R1003"]),
+]
+
+def replay(responses, requested):
+    """A stand-in for fetch_json() that answers from recorded responses."""
+    def fetch_json(url, timeout=15, payload=None, stats=None):
+        key = f"{url}#{payload['offset']}" if payload else url
+        requested.append(key)
+        if key not in responses:
+            return None, {'kind': 'http', 'status': 404, 'transient': False,
+                          'description': "HTTP 404 (not recorded)", 'retry_after': None}
+        return json.loads((FIXTURES_DIR / responses[key]).read_text()), None
+    return fetch_json
+
+def make_board(postings):
+    """Build a Greenhouse response and the equivalent HTML listing page."""
+    roles = ["Senior Epic Analyst", "Clinical Informatics Engineer", "Nurse Manager",
+             "Python Developer II", "Physician Assistant", "Facilities Technician"]
+    jobs = [{"id": n, "title": f"{roles[n % len(roles)]} {n}",
+             "absolute_url": f"https://boards.greenhouse.io/example/jobs/{n}",
+             "location": {"name": "Portland, OR"}} for n in range(postings)]
+    html = "".join(
+        f'<div class="opening"><a href="/example/jobs/{job["id"]}">{job["title"]}</a>'
+        f'<span class="location">Portland, OR</span></div>'
+        for job in jobs
+    )
+    return {"jobs": jobs}, f"<html><body>{html}</body></html>"
+
+def best_of(fn, repeat=5):
+    """Return the fastest wall-clock time of several runs, in milliseconds."""
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+def main():
+    postings = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    for url, responses, expected in CASES:
+        requested = []
+        ats.fetch_json = replay(responses, requested)
+        result = scanner.check_site({"name": "Example", "url": url}, KEYWORDS, NEGATIVE_KEYWORDS)
+        jobs, failure = result['jobs'], result['failure']
+        found = [job['url'] for job in jobs]
+        if failure or found != expected or sorted(requested) != sorted(responses):
+            print(f"❌ {url}: got {found} ({failure}), requested {requested}")
+            sys.exit(1)
+        print(f"✓ {ats.detect_ats(url)[0]:<11} {len(requested)} request(s), {len(jobs)} matching jobs")
+
+    data, html = make_board(postings)
+    body = json.dumps(data)
+    base_url = "https://boards.greenhouse.io/example"
+    api_ms = best_of(lambda: ats.api_jobs(ats.decode_greenhouse(json.loads(body)), "Example",
+                                      KEYWORDS, NEGATIVE_KEYWORDS))
+    html_ms = best_of(lambda: extract.extract_jobs(html, base_url, "Example", KEYWORDS, NEGATIVE_KEYWORDS))
+    print(f"\n{postings:,} postings: API {len(body) / 1e6:.2f} MB decoded in {api_ms:.1f}ms, "
+          f"HTML {len(html) / 1e6:.2f} MB scraped in {html_ms:.1f}ms")
+
+if __name__ == "__main__":
+    main()
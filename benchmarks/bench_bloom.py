@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Seen-Jobs Lookup Benchmark
+Compares memory and lookup time of a Python set, the SQLite history and
+the Bloom filter pre-check for a large job history
+
+Usage: python benchmarks/bench_bloom.py [entries] [false_positive_rate]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+sys.path.insert(0, str(TEMPLATES_DIR))
+
+from job_scanner import bloom as bloom_filter, history as seen_history
+
+LOOKUPS = 100_000
+
+def fake_id(n):
+    """A job ID shaped like the ones the monitor stores."""
+    return seen_history.job_id(f"Site {n % 500}", f"Clinical Informatics Analyst {n}",
+                               f"https://careers.example.org/jobs/{n}")
+
+def set_memory(ids):
+    """Approximate bytes held by a set of strings."""
+    return sys.getsizeof(ids) + sum(sys.getsizeof(jid) for jid in ids)
+
+def timed(fn):
+    """Run fn once and return (result, seconds)."""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    fp_rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0.01
+
+    ids = [fake_id(n) for n in range(entries)]
+    # Half the lookups are known jobs, half are new
+    probes = ids[:LOOKUPS // 2] + [fake_id(entries + n) for n in range(LOOKUPS // 2)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history_db = Path(tmp) / "history.db"
+        bloom_file = Path(tmp) / "history.bloom"
+        history = seen_history.load_history(history_db)
+        with history:
+            history.executemany(
+                "INSERT INTO seen_jobs VALUES (?, ?, '2026-01-01', '2026-01-01')",
+                ((jid, jid.split('|', 1)[0]) for jid in ids)
+            )
+
+        seen_set, set_build = timed(lambda: set(row[0] for row in history.execute("SELECT job_id FROM seen_jobs")))
+        bloom, bloom_build = timed(lambda: bloom_filter.build_bloom(history, entries, fp_rate))
+        bloom_filter.save_bloom(bloom, bloom_file)
+        _, bloom_load = timed(lambda: bloom_filter.load_bloom(bloom_file, entries, fp_rate))
+
+        _, set_lookup = timed(lambda: [jid in seen_set for jid in probes])
+        _, db_lookup = timed(lambda: seen_history.find_seen_ids(history, probes))
+        _, bloom_lookup = timed(lambda: seen_history.find_seen_ids(history, probes, bloom))
+        _, bloom_only = timed(lambda: [bloom_filter.bloom_might_contain(bloom, jid) for jid in probes])
+
+        new_ids = probes[LOOKUPS // 2:]
+        false_positives = sum(bloom_filter.bloom_might_contain(bloom, jid) for jid in new_ids)
+        db_size = history_db.stat().st_size
+        bloom_size = bloom_file.stat().st_size
+        history.close()
+
+    print(f"{entries:,} seen jobs, {LOOKUPS:,} lookups (half new)\n")
+    print(f"{'':<24} {'Memory':>10} {'Load':>10} {'Lookups':>10}")
+    print(f"{'Python set (old way)':<24} {set_memory(seen_set) / 1e6:8.1f}MB {set_build:9.2f}s {set_lookup:9.3f}s")
+    print(f"{'SQLite only':<24} {'on disk':>10} {'-':>10} {db_lookup:9.3f}s")
+    print(f"{'Bloom + SQLite':<24} {len(bloom['bits']) / 1e6:8.1f}MB {bloom_load:9.2f}s {bloom_lookup:9.3f}s")
+    print(f"{'Bloom check alone':<24} {'':>10} {'':>10} {bloom_only:9.3f}s")
+    print(f"\nBloom filter: {bloom['hashes']} hashes, built in {bloom_build:.1f}s, "
+          f"file {bloom_size / 1e6:.1f} MB (database {db_size / 1e6:.1f} MB)")
+    print(f"False positive rate: {false_positives / len(new_ids):.4f} (target {fp_rate})")
+
+if __name__ == "__main__":
+    main()
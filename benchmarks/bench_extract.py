@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Extraction Benchmark
+Compares the precompiled extractors against the original re.findall() versions,
+and the JSON-LD fast path against scanning the same page with patterns
+
+Usage: python benchmarks/bench_extract.py [page_size_mb]
+"""
+
+import json
+import random
+import re
+import sys
+import timeit
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+sys.path.insert(0, str(TEMPLATES_DIR))
+
+from job_scanner import extract, matching
+
+KEYWORDS = ["Analyst", "Engineer", "Informatics", "Developer", "Epic"]
+NEGATIVE_KEYWORDS = ["nurse", "physician", "intern"]
+
+def absolute_url(href, base_url):
+    """Make a link absolute the way the original extractors did."""
+    if href.startswith('/'):
+        parsed = urlparse(base_url)
+        return f"{parsed.scheme}://{parsed.netloc}{href}"
+    elif not href.startswith('http'):
+        return urljoin(base_url, href)
+    return href
+
+def dedupe(jobs):
+    """Drop jobs whose title (case-insensitive) was already seen."""
+    seen_titles = set()
+    unique_jobs = []
+    for job in jobs:
+        if job['title'].lower() not in seen_titles:
+            seen_titles.add(job['title'].lower())
+            unique_jobs.append(job)
+    return unique_jobs
+
+def legacy_extract_jobs(html, base_url, site_name, keywords, negative_keywords, matches_keywords):
+    """The original monitor extract_jobs(): four re.findall() passes."""
+    jobs = []
+    link_pattern = r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>([^<]*)</a>'
+    for href, text in re.findall(link_pattern, html, re.IGNORECASE):
+        text = text.strip()
+        if len(text) > 10 and matches_keywords(text, keywords, negative_keywords):
+            jobs.append({'title': text[:100], 'url': absolute_url(href, base_url), 'site': site_name})
+
+    title_patterns = [
+        r'class="[^"]*title[^"]*"[^>]*>([^<]+)<',
+        r'<h[23][^>]*>([^<]+)</h[23]>',
+        r'"title"\s*:\s*"([^"]+)"',
+    ]
+    for pattern in title_patterns:
+        for match in re.findall(pattern, html, re.IGNORECASE):
+            text = match.strip()
+            if len(text) > 10 and len(text) < 150 and matches_keywords(text, keywords, negative_keywords):
+                jobs.append({'title': text, 'url': base_url, 'site': site_name})
+    return dedupe(jobs)
+
+def legacy_extract_all_jobs(html, base_url):
+    """The original health check extract_all_jobs(): five re.findall() passes."""
+    jobs = []
+    link_pattern = r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>([^<]*)</a>'
+    for href, text in re.findall(link_pattern, html, re.IGNORECASE):
+        text = text.strip()
+        if len(text) > 10 and len(text) < 200:
+            if any(skip in text.lower() for skip in ['home', 'about', 'contact', 'login', 'sign in', 'careers home']):
+                continue
+            jobs.append({'title': text[:100], 'url': absolute_url(href, base_url)})
+
+    title_patterns = [
+        r'class="[^"]*title[^"]*"[^>]*>([^<]+)<',
+        r'class="[^"]*job[^"]*"[^>]*>([^<]+)<',
+        r'<h[23][^>]*>([^<]+)</h[23]>',
+        r'"title"\s*:\s*"([^"]+)"',
+    ]
+    for pattern in title_patterns:
+        for match in re.findall(pattern, html, re.IGNORECASE):
+            text = match.strip()
+            if len(text) > 10 and len(text) < 150:
+                if any(skip in text.lower() for skip in ['home', 'about', 'contact', 'login']):
+                    continue
+                jobs.append({'title': text, 'url': base_url})
+    return dedupe(jobs)
+
+def make_page(size_mb, seed=1):
+    """Build a synthetic career page of roughly size_mb megabytes."""
+    rng = random.Random(seed)
+    roles = ["Senior Epic Analyst", "Clinical Informatics Engineer", "Nurse Manager",
+             "Python Developer II", "Physician Assistant", "Data Engineer Intern",
+             "Epic Cadence Analyst", "Facilities Technician"]
+    parts = ['<html><head><script>window.__STATE__={"jobs":[']
+    size = 0
+    n = 0
+    while size < size_mb * 1_000_000:
+        n += 1
+        role = f"{rng.choice(roles)} {n}"
+        blob = "x" * rng.randint(20, 400)
+        card = (
+            f'{{"id":{n},"title":"{role}","meta":"{blob}"}},'
+            f'<div class="card" data-blob="{blob}">'
+            f'<h3 class="job-title">{role} (Remote)</h3>'
+            f'<a class="job-title-link" href="/jobs/{n}">{role} - Apply</a>'
+            f'<a href="https://example.org/nav/{n}">Home</a>'
+            f'<span class="posting-title">{role}, Portland</span>'
+            f'<div class="job-meta">{role} / Full time</div></div>'
+        )
+        parts.append(card)
+        size += len(card)
+    parts.append(']}</script></head><body></body></html>')
+    return "".join(parts)
+
+def make_json_ld_page(size_mb):
+    """A synthetic page whose jobs are also embedded as JSON-LD JobPostings."""
+    page = make_page(size_mb)
+    postings = [
+        {"@type": "JobPosting", "title": title, "url": f"/jobs/{n}", "datePosted": "2026-10-01",
+         "jobLocation": {"@type": "Place", "address": {"addressLocality": "Portland", "addressRegion": "OR"}}}
+        for n, title in enumerate(re.findall(r'<h3 class="job-title">([^<]+)</h3>', page))
+    ]
+    block = json.dumps({"@context": "https://schema.org", "@graph": postings})
+    return page.replace('<body>', f'<body><script type="application/ld+json">{block}</script>')
+
+def best_of(fn, repeat=5):
+    """Return the fastest wall-clock time of several runs, in milliseconds."""
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 4
+    base_url = "https://careers.example.org/search"
+
+    pages = {
+        "lowercase markup": make_page(size_mb),
+        "UPPERCASE markup": make_page(size_mb).replace('class=', 'CLASS=').replace('<a ', '<A '),
+        "dotless-i text": make_page(size_mb) + "<p>ı</p>",
+    }
+
+    print(f"{'Page':<18} {'Extractor':<18} {'Original':>10} {'Current':>10} {'Speedup':>8}")
+    for label, html in pages.items():
+        cases = [
+            ("extract_jobs",
+             lambda: legacy_extract_jobs(html, base_url, "Example", KEYWORDS, NEGATIVE_KEYWORDS,
+                                         matching.matches_keywords),
+             lambda: extract.extract_jobs(html, base_url, "Example", KEYWORDS, NEGATIVE_KEYWORDS)),
+            ("extract_all_jobs",
+             lambda: legacy_extract_all_jobs(html, base_url),
+             lambda: extract.extract_all_jobs(html, base_url)),
+        ]
+        for name, legacy, current in cases:
+            if legacy() != current():
+                print(f"❌ {name} results differ from the original on {label} page")
+                sys.exit(1)
+            legacy_ms = best_of(legacy)
+            current_ms = best_of(current)
+            print(f"{label:<18} {name:<18} {legacy_ms:8.1f}ms {current_ms:8.1f}ms {legacy_ms / current_ms:7.2f}x")
+
+    html = make_json_ld_page(size_mb)
+    legacy_ms = best_of(lambda: legacy_extract_jobs(html, base_url, "Example", KEYWORDS, NEGATIVE_KEYWORDS,
+                                                    matching.matches_keywords))
+    current_ms = best_of(lambda: extract.extract_jobs(html, base_url, "Example", KEYWORDS, NEGATIVE_KEYWORDS))
+    print(f"{'JSON-LD page':<18} {'extract_jobs':<18} {legacy_ms:8.1f}ms {current_ms:8.1f}ms {legacy_ms / current_ms:7.2f}x")
+
+    print(f"\nPage size ~{size_mb} MB; results identical to the original extractors "
+          f"(except on the JSON-LD page, which reads the structured data instead).")
+
+if __name__ == "__main__":
+    main()
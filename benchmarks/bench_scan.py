@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Scan Pipeline Benchmark
+Runs the scan pipeline against the local replay server (benchmarks/replay.py)
+at 10, 100 and 1000 sites, timing each stage (fetch, extract, match, dedup,
+history save, report) and a full monitor run end to end in sites/sec
+
+Usage: python benchmarks/bench_scan.py [--corpus corpus_dir] [--latency-ms 20]
+                                       [--error-rate 0.0] [--sizes 10,100,1000]
+                                       [--extract-processes 0|N|auto]
+
+Without --corpus, a synthetic corpus of career pages is generated.
+--extract-processes sets "extract_processes" for the full monitor runs.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+sys.path.insert(0, str(TEMPLATES_DIR))
+
+from bench_extract import KEYWORDS, NEGATIVE_KEYWORDS, make_page
+from replay import CORPUS_INDEX, load_corpus, replay_config, start_server
+
+from job_scanner import monitor
+from job_scanner.cache import load_http_cache
+from job_scanner.extract import extract_jobs, find_candidates
+from job_scanner.fetch import configure_host_limits, fetch_page
+from job_scanner.history import find_seen_ids, job_id, load_history, prune_history, save_history
+from job_scanner.matching import keyword_matcher
+from job_scanner.report import format_email_body, format_results
+from job_scanner.snapshot import load_snapshot
+
+STAGES = ["fetch", "extract", "match", "dedup", "history save", "report"]
+
+def synthetic_corpus(corpus_dir, pages=20, size_kb=60):
+    """Write a corpus of generated career pages."""
+    (corpus_dir / "pages").mkdir(parents=True, exist_ok=True)
+    entries = []
+    for n in range(pages):
+        entry = {"name": f"Synthetic {n}", "url": f"https://careers.example.org/{n}", "status": 200,
+                 "file": f"pages/{n:04d}.html"}
+        (corpus_dir / entry["file"]).write_text(make_page(size_kb / 1000, seed=n), encoding='utf-8')
+        entries.append(entry)
+    (corpus_dir / CORPUS_INDEX).write_text(json.dumps(
+        {"keywords": KEYWORDS, "negative_keywords": NEGATIVE_KEYWORDS, "pages": entries}))
+
+def make_app(directory):
+    """File locations and wording for a monitor run inside directory."""
+    return {
+        "config_file": directory / "config.json",
+        "history_file": directory / ".job_history.json",
+        "history_db": directory / ".job_history.db",
+        "bloom_file": directory / ".job_history.bloom",
+        "http_cache_file": directory / ".http_cache.json",
+        "output_file": directory / "job_results.txt",
+        "metrics_file": directory / "scan_metrics.jsonl",
+        "failed_sites_bat": directory / "open_failed_sites.bat",
+        "outbox_dir": directory / "outbox",
+        "snapshot_dir": directory / ".snapshot",
+        "banner": "Replay benchmark",
+        "name": "Job Monitor",
+        "results_heading": "JOB SEARCH RESULTS",
+        "checking": "Checking",
+        "checked": "Checked",
+        "check": "check",
+        "run": "run",
+    }
+
+def timed(timings, stage, fn):
+    """Run fn, adding its wall-clock seconds to timings[stage]."""
+    start = time.perf_counter()
+    result = fn()
+    timings[stage] = timings.get(stage, 0) + time.perf_counter() - start
+    return result
+
+def run_stages(config, directory):
+    """Time each pipeline stage on its own over every site in config.
+
+    Returns (timings, counts). Half the jobs are put in the history first,
+    as if seen on an earlier run, so the dedup stage finds both kinds.
+    """
+    sites = config['career_sites']
+    keywords, negative_keywords = config['keywords'], config['negative_keywords']
+    timings = {}
+
+    def fetch(site):
+        html, _, failure, _ = fetch_page(site['url'])
+        return html if not failure else None
+    with ThreadPoolExecutor(max_workers=config['fetch_workers']) as executor:
+        bodies = timed(timings, "fetch", lambda: list(executor.map(fetch, sites)))
+
+    candidates = timed(timings, "extract", lambda: [find_candidates(html) if html else ([], []) for html in bodies])
+    matches = keyword_matcher(tuple(keywords), tuple(negative_keywords))
+    timed(timings, "match", lambda: [
+        [text for _, text in links if matches(text)] + [text for text in titles if matches(text)]
+        for links, titles in candidates
+    ])
+
+    all_jobs = []
+    for site, html in zip(sites, bodies):
+        if html:
+            all_jobs.extend(extract_jobs(html, site['url'], site['name'], keywords, negative_keywords))
+    history = load_history(directory / "stages.db")
+    save_history(history, all_jobs[::2])
+
+    def dedup():
+        job_ids = [job_id(job['site'], job['title'], job['url']) for job in all_jobs]
+        seen = find_seen_ids(history, job_ids)
+        new_jobs = []
+        for job, jid in zip(all_jobs, job_ids):
+            if jid not in seen:
+                new_jobs.append(job)
+                seen.add(jid)
+        return new_jobs
+    new_jobs = timed(timings, "dedup", dedup)
+
+    def history_save():
+        save_history(history, all_jobs)
+        prune_history(history, 180, 200000)
+    timed(timings, "history save", history_save)
+    history.close()
+
+    app = make_app(directory)
+    timed(timings, "report", lambda: (format_results(new_jobs, all_jobs, [], False, app),
+                                      format_email_body(new_jobs, [], app)))
+    counts = {
+        "pages": sum(html is not None for html in bodies),
+        "bytes": sum(len(html) for html in bodies if html),
+        "candidates": sum(len(links) + len(titles) for links, titles in candidates),
+        "jobs": len(all_jobs),
+        "new": len(new_jobs),
+    }
+    return timings, counts
+
+def run_monitor(config, directory):
+    """Time one full monitor run (no email) and return its seconds."""
+    app = make_app(directory)
+    app["config_file"].write_text(json.dumps(config))
+    history = load_history(app["history_db"])
+    http_cache = load_http_cache(app["http_cache_file"], config['keywords'], config['negative_keywords'])
+    snapshot = load_snapshot(app["snapshot_dir"])
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        monitor.run_scan(config, config['career_sites'], history, None, http_cache, snapshot, app, no_email=True)
+    seconds = time.perf_counter() - start
+    history.close()
+    return seconds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--corpus", type=Path, help="recorded corpus (default: synthetic pages)")
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--sizes", default="10,100,1000")
+    parser.add_argument("--extract-processes", default="0")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = args.corpus
+        if corpus_dir is None:
+            corpus_dir = Path(tmp) / "corpus"
+            synthetic_corpus(corpus_dir)
+        corpus = load_corpus(corpus_dir)
+        server = start_server(corpus, latency_ms=args.latency_ms, error_rate=args.error_rate)
+        print(f"{len(corpus['pages'])} pages served with {args.latency_ms:g}ms latency, "
+              f"{args.error_rate:.0%} errors, extract_processes {args.extract_processes}\n")
+        print(f"{'Sites':>6} " + " ".join(f"{stage:>12}" for stage in STAGES)
+              + f" {'Full run':>10} {'Sites/sec':>10}")
+
+        for size in (int(n) for n in args.sizes.split(",")):
+            config = replay_config(server, corpus, size)
+            config['extract_processes'] = args.extract_processes if args.extract_processes == "auto" \
+                else int(args.extract_processes)
+            configure_host_limits(config)
+            directory = Path(tmp) / f"run{size}"
+            directory.mkdir()
+            timings, counts = run_stages(config, directory)
+            seconds = run_monitor(config, directory)
+            print(f"{size:>6} " + " ".join(f"{timings[stage] * 1000:10.1f}ms" for stage in STAGES)
+                  + f" {seconds:9.2f}s {size / seconds:10.1f}")
+            print(f"{'':>6} {counts['pages']} pages, {counts['bytes'] / 1e6:.1f} MB, "
+                  f"{counts['candidates']:,} candidates, {counts['jobs']:,} matching jobs "
+                  f"({counts['new']:,} new)")
+
+        server.shutdown()
+        print(f"\nServer answered {server.served['requests']:,} requests "
+              f"({server.served['errors']:,} errors)")
+
+if __name__ == "__main__":
+    main()
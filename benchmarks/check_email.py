@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Email Delivery Check
+Runs the job_scanner email sender against a local stand-in SMTP server (no
+real mail is sent) and checks that messages queued while the server is down
+stay in the outbox and go out on the next run, that one run's messages share
+a single SMTP connection, and that a connection the server drops between
+messages is reopened once
+
+Usage: python benchmarks/check_email.py
+"""
+
+import contextlib
+import io
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+sys.path.insert(0, str(TEMPLATES_DIR))
+
+from job_scanner.notify import finish_email_delivery, send_email, start_email_delivery
+
+def make_handler(received, drop_after):
+    """Build a handler speaking just enough SMTP for smtplib.
+
+    received counts 'connections' and collects the 'subjects' delivered.
+    With drop_after, each connection is closed after that many messages, as
+    a server timing out an idle connection would.
+    """
+    lock = threading.Lock()
+
+    class SMTPHandler(socketserver.StreamRequestHandler):
+        def reply(self, line):
+            self.wfile.write(line.encode('ascii') + b"\r\n")
+
+        def handle(self):
+            with lock:
+                received["connections"] += 1
+            delivered = 0
+            self.reply("220 localhost stand-in SMTP")
+            for line in self.rfile:
+                command = line[:4].upper()
+                if command in (b"EHLO", b"HELO"):
+                    self.reply("250 localhost")
+                elif command in (b"MAIL", b"RCPT", b"RSET", b"NOOP"):
+                    self.reply("250 OK")
+                elif command == b"DATA":
+                    self.reply("354 End data with <CR><LF>.<CR><LF>")
+                    subject = None
+                    for data_line in self.rfile:
+                        if data_line == b".\r\n":
+                            break
+                        if data_line.startswith(b"Subject: "):
+                            subject = data_line[9:].decode('ascii').strip()
+                    with lock:
+                        received["subjects"].append(subject)
+                    self.reply("250 OK")
+                    delivered += 1
+                    if drop_after and delivered >= drop_after:
+                        return
+                elif command == b"QUIT":
+                    self.reply("221 Bye")
+                    return
+                else:
+                    self.reply("502 Command not implemented")
+
+    return SMTPHandler
+
+class SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+def start_server(port, drop_after=None):
+    """Serve SMTP on 127.0.0.1:port from a background thread.
+
+    Returns the server; server.received holds what it was sent. Call
+    server.shutdown() and server.server_close() when done.
+    """
+    received = {"connections": 0, "subjects": []}
+    server = SMTPServer(("127.0.0.1", port), make_handler(received, drop_after))
+    server.received = received
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def free_port():
+    """A local port nothing is listening on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def run(config, outbox, subjects):
+    """One monitor run's email handling: retry the outbox, queue subjects, finish.
+
+    Returns the delivery dict and what finish_email_delivery() printed.
+    """
+    delivery = start_email_delivery(config, outbox)
+    for subject in subjects:
+        send_email(config, subject, "Job list", delivery)
+    printed = io.StringIO()
+    with contextlib.redirect_stdout(printed):
+        finish_email_delivery(delivery)
+    return delivery, printed.getvalue()
+
+def check(ok, description, detail):
+    """Print a check's outcome, exiting on failure."""
+    if not ok:
+        print(f"❌ {description}: {detail}")
+        sys.exit(1)
+    print(f"✓ {description}")
+
+def main():
+    port = free_port()
+    config = {"email": "me@example.org", "smtp_host": "127.0.0.1", "smtp_port": port, "smtp_starttls": False}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        outbox = Path(tmp) / "outbox"
+
+        delivery, printed = run(config, outbox, ["Run 1 A", "Run 1 B"])
+        queued = sorted(outbox.glob('*.eml'))
+        check(delivery["sent"] == 0 and delivery["kept"] == 2 and len(queued) == 2,
+              "server down: both emails kept in the outbox",
+              f"sent {delivery['sent']}, kept {delivery['kept']}, {len(queued)} in outbox\n{printed}")
+
+        server = start_server(port)
+        try:
+            delivery, printed = run(config, outbox, ["Run 2"])
+        finally:
+            server.shutdown()
+            server.server_close()
+        received = server.received
+        check(received["subjects"] == ["Run 1 A", "Run 1 B", "Run 2"] and not list(outbox.glob('*.eml')),
+              "server back: outbox retried in order, then the new email",
+              f"server got {received['subjects']}, outbox {[p.name for p in outbox.glob('*.eml')]}\n{printed}")
+        check(received["connections"] == 1, "three emails sent over one SMTP connection",
+              f"{received['connections']} connections")
+
+        server = start_server(port, drop_after=1)
+        try:
+            delivery, printed = run(config, outbox, ["Run 3 A", "Run 3 B"])
+        finally:
+            server.shutdown()
+            server.server_close()
+        received = server.received
+        check(received["subjects"] == ["Run 3 A", "Run 3 B"] and received["connections"] == 2
+              and delivery["error"] is None,
+              "dropped connection reopened once and the email still sent",
+              f"server got {received['subjects']} over {received['connections']} connections, "
+              f"error {delivery['error']}\n{printed}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Record/Replay Harness
+Records the career pages in a config.json into a fixture corpus, and serves
+a corpus from a local stand-in HTTP server with configurable latency and
+error rate, so scans can be measured without touching live career sites
+
+Usage:
+    python benchmarks/replay.py record config.json corpus_dir
+    python benchmarks/replay.py serve corpus_dir [--sites N] [--port 8800]
+                                      [--latency-ms 20] [--error-rate 0.0]
+
+serve writes corpus_dir/replay_config.json, a config with N sites pointing
+at the local server (cycling through the recorded pages), for use with
+job_scanner.scan() or as a monitor's config.json.
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+sys.path.insert(0, str(TEMPLATES_DIR))
+
+from job_scanner.fetch import DEFAULT_FETCH_WORKERS, configure_host_limits, fetch_page
+
+CORPUS_INDEX = "index.json"
+
+def record(config, corpus_dir):
+    """Fetch the first page of every site in a config into corpus_dir.
+
+    Failed fetches are recorded too (with their HTTP status, or 502 for
+    network errors) so replaying the corpus reproduces them.
+    """
+    pages_dir = corpus_dir / "pages"
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    configure_host_limits(config)
+
+    def fetch(numbered_site):
+        n, site = numbered_site
+        stats = {}
+        html, _, failure, _ = fetch_page(site['url'], stats=stats)
+        entry = {"name": site['name'], "url": site['url'], "seconds": round(stats.get('seconds', 0), 3)}
+        if failure or not html:
+            entry["status"] = (failure or {}).get('status') or 502
+        else:
+            entry["status"] = 200
+            entry["file"] = f"pages/{n:04d}.html"
+            (corpus_dir / entry["file"]).write_text(html, encoding='utf-8')
+        return entry
+
+    with ThreadPoolExecutor(max_workers=config.get('fetch_workers', DEFAULT_FETCH_WORKERS)) as executor:
+        entries = list(executor.map(fetch, enumerate(config['career_sites'])))
+    (corpus_dir / CORPUS_INDEX).write_text(json.dumps(
+        {"keywords": config['keywords'], "negative_keywords": config.get('negative_keywords', []),
+         "pages": entries}, indent=2))
+    return entries
+
+def load_corpus(corpus_dir):
+    """Load a recorded corpus: its keywords and (status, body) for every page."""
+    index = json.loads((corpus_dir / CORPUS_INDEX).read_text())
+    pages = [
+        (entry["status"], (corpus_dir / entry["file"]).read_bytes() if "file" in entry else b"")
+        for entry in index["pages"]
+    ]
+    return {"keywords": index["keywords"], "negative_keywords": index.get("negative_keywords", []),
+            "pages": pages}
+
+def make_handler(corpus, latency_ms, error_rate, seed):
+    """Build a request handler serving /site/<n> from the corpus."""
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+    served = {"requests": 0, "errors": 0}
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            with rng_lock:
+                delay = latency_ms / 1000 * rng.uniform(0.5, 1.5)
+                fail = rng.random() < error_rate
+                served["requests"] += 1
+            time.sleep(delay)
+            try:
+                n = int(self.path.split('?')[0].rstrip('/').rsplit('/', 1)[1])
+                status, body = corpus["pages"][n % len(corpus["pages"])]
+            except (ValueError, IndexError):
+                status, body = 404, b""
+            if fail:
+                status, body = 503, b""
+            if status != 200:
+                with rng_lock:
+                    served["errors"] += 1
+                body = b"<html><body>unavailable</body></html>"
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ReplayHandler, served
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        """Ignore clients that hang up without reading an error response."""
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+def start_server(corpus, port=0, latency_ms=20, error_rate=0.0, seed=1):
+    """Serve a corpus on 127.0.0.1 from a background thread.
+
+    Returns the server; server.served counts requests and injected errors.
+    Call server.shutdown() when done.
+    """
+    handler, served = make_handler(corpus, latency_ms, error_rate, seed)
+    server = ReplayServer(("127.0.0.1", port), handler)
+    server.served = served
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def replay_config(server, corpus, sites, workers=DEFAULT_FETCH_WORKERS):
+    """A config.json dict with the given number of sites on the replay server.
+
+    All sites share one host, so the per-host politeness limits are lifted
+    to let the scan run at full concurrency.
+    """
+    port = server.server_address[1]
+    return {
+        "keywords": corpus["keywords"],
+        "negative_keywords": corpus["negative_keywords"],
+        "career_sites": [
+            {"name": f"Replay Site {n}", "url": f"http://127.0.0.1:{port}/site/{n}"} for n in range(sites)
+        ],
+        "fetch_workers": workers,
+        "host_requests_per_second": 1_000_000,
+        "host_burst": 1_000_000,
+        "host_max_connections": workers,
+        "retry_backoff_seconds": 0.05,
+        "email": "replay@example.com",
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Record career pages or replay them from a local server.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_command = commands.add_parser("record", help="fetch every site in a config into a corpus")
+    record_command.add_argument("config", type=Path)
+    record_command.add_argument("corpus", type=Path)
+    serve_command = commands.add_parser("serve", help="serve a recorded corpus locally")
+    serve_command.add_argument("corpus", type=Path)
+    serve_command.add_argument("--sites", type=int, default=100)
+    serve_command.add_argument("--port", type=int, default=8800)
+    serve_command.add_argument("--latency-ms", type=float, default=20)
+    serve_command.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        entries = record(json.loads(args.config.read_text()), args.corpus)
+        ok = sum(entry["status"] == 200 for entry in entries)
+        print(f"Recorded {ok} of {len(entries)} pages into {args.corpus}")
+        return
+
+    corpus = load_corpus(args.corpus)
+    server = start_server(corpus, args.port, args.latency_ms, args.error_rate)
+    config_path = args.corpus / "replay_config.json"
+    config_path.write_text(json.dumps(replay_config(server, corpus, args.sites), indent=2))
+    print(f"Serving {len(corpus['pages'])} recorded pages as {args.sites} sites on "
+          f"http://127.0.0.1:{args.port}/site/<n> ({args.latency_ms:g}ms latency, "
+          f"{args.error_rate:.0%} errors)")
+    print(f"Config: {config_path} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
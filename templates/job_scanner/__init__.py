@@ -0,0 +1,13 @@
+"""
+Job scanner package shared by the job monitor and health check scripts
+
+Other tools can scan the sites in a config.json directly:
+
+    from job_scanner import load_config, scan
+    for site, result in scan(load_config("config.json")):
+        print(site['name'], len(result['jobs']), result['failure'])
+"""
+
+from .scanner import check_site, iter_scan, load_config, scan
+
+__all__ = ["check_site", "iter_scan", "load_config", "scan"]
@@ -0,0 +1,188 @@
+"""
+Adapters reading applicant tracking system job boards (Greenhouse, Lever,
+Ashby, Workday) through their public JSON APIs instead of scraping the page
+"""
+
+import re
+
+from .fetch import classify_failure, fetch_json
+from .matching import keyword_matcher
+
+# Applicant tracking systems with a public JSON job listing, recognized by
+# the career site URL. Sites on them are read through the API instead of
+# scraping the page, which finds jobs on pages that build their listing in
+# JavaScript. A site can force one with "ats" in config.json, or "ats": "html"
+# to always scrape. Listings are read at most MAX_API_PAGES pages deep.
+ATS_URL_PATTERNS = {
+    'greenhouse': re.compile(r'https?://(?:boards|job-boards)(?:\.eu)?\.greenhouse\.io/(?:embed/job_board\?for=)?([\w.-]+)', re.IGNORECASE),
+    'lever': re.compile(r'https?://jobs\.(eu\.)?lever\.co/([\w.-]+)', re.IGNORECASE),
+    'ashby': re.compile(r'https?://jobs\.ashbyhq\.com/([\w.%-]+)', re.IGNORECASE),
+    'workday': re.compile(r'https?://(([\w-]+)\.wd\d+\.myworkdayjobs\.com)/(?:([a-z]{2}-[A-Z]{2})/)?([\w-]+)', re.IGNORECASE),
+}
+LEVER_PAGE_SIZE = 100
+WORKDAY_PAGE_SIZE = 20
+MAX_API_PAGES = 50
+
+# API errors the decoders below raise on a response of some other shape
+# (an error object, an HTML page served as JSON), reported as a permanent
+# failure so the site falls back to scanning its page
+UNEXPECTED_RESPONSE_ERRORS = (KeyError, TypeError, AttributeError)
+
+def unexpected_response():
+    """The failure for an API response the decoders can't read."""
+    failure = classify_failure()
+    failure['description'] = "unexpected API response"
+    return failure
+
+def complete_postings(pairs):
+    """Keep the (title, url) pairs that have both, as non-empty strings."""
+    return [
+        (title, url) for title, url in pairs
+        if isinstance(title, str) and title.strip() and isinstance(url, str) and url
+    ]
+
+def decode_greenhouse(data):
+    """Return (title, url) pairs from a Greenhouse job board response."""
+    return complete_postings((job.get('title'), job.get('absolute_url')) for job in data.get('jobs', []))
+
+def decode_lever(data):
+    """Return (title, url) pairs from a page of Lever postings."""
+    return complete_postings((job.get('text'), job.get('hostedUrl')) for job in data)
+
+def decode_ashby(data):
+    """Return (title, url) pairs from an Ashby job board response."""
+    return complete_postings(
+        (job.get('title'), job.get('jobUrl')) for job in data.get('jobs', []) if job.get('isListed', True)
+    )
+
+def decode_workday(data, site_url):
+    """Return (title, url) pairs from a page of Workday job postings."""
+    return complete_postings(
+        (job.get('title'), site_url + job['externalPath'] if isinstance(job.get('externalPath'), str) else None)
+        for job in data.get('jobPostings', [])
+    )
+
+def ats_host(name, match):
+    """The host an ATS site's API requests go to, which its per-host limits apply to."""
+    if name == 'greenhouse':
+        return "boards-api.greenhouse.io"
+    if name == 'lever':
+        return f"api.{match.group(1) or ''}lever.co"
+    if name == 'ashby':
+        return "api.ashbyhq.com"
+    return match.group(1).lower()
+
+def fetch_greenhouse(match, on_page=None, stats=None):
+    """Read every posting from a Greenhouse board (the API does not page)."""
+    data, failure = fetch_json(f"https://{ats_host('greenhouse', match)}/v1/boards/{match.group(1)}/jobs", stats=stats)
+    if data is None:
+        return None, failure
+    try:
+        postings = decode_greenhouse(data)
+    except UNEXPECTED_RESPONSE_ERRORS:
+        return None, unexpected_response()
+    if on_page:
+        on_page(postings, False)
+    return postings, None
+
+def fetch_lever(match, on_page=None, stats=None):
+    """Read every posting from a Lever board, a page at a time.
+
+    Like the other fetchers, on_page(postings, more) is called with each
+    page as it arrives, saying whether more pages follow, and can return
+    True to stop reading. Request time and bytes are added to stats, if
+    given (see fetch_page()). A response the decoder can't read fails the
+    whole board with unexpected_response().
+    """
+    api = f"https://{ats_host('lever', match)}/v0/postings/{match.group(2)}"
+    postings = []
+    for page in range(MAX_API_PAGES):
+        data, failure = fetch_json(f"{api}?mode=json&skip={page * LEVER_PAGE_SIZE}&limit={LEVER_PAGE_SIZE}",
+                                   stats=stats)
+        if data is None:
+            return None, failure
+        try:
+            decoded = decode_lever(data)
+        except UNEXPECTED_RESPONSE_ERRORS:
+            return None, unexpected_response()
+        postings.extend(decoded)
+        more = len(data) == LEVER_PAGE_SIZE
+        if (on_page and on_page(decoded, more)) or not more:
+            break
+    return postings, None
+
+def fetch_ashby(match, on_page=None, stats=None):
+    """Read every posting from an Ashby board (the API does not page)."""
+    data, failure = fetch_json(f"https://{ats_host('ashby', match)}/posting-api/job-board/{match.group(1)}", stats=stats)
+    if data is None:
+        return None, failure
+    try:
+        postings = decode_ashby(data)
+    except UNEXPECTED_RESPONSE_ERRORS:
+        return None, unexpected_response()
+    if on_page:
+        on_page(postings, False)
+    return postings, None
+
+def fetch_workday(match, on_page=None, stats=None):
+    """Read every posting from a Workday career site, a page at a time.
+
+    Workday only reports the total on the first page, so that total is
+    kept for the rest.
+    """
+    host, tenant, language, site = match.groups()
+    api = f"https://{host}/wday/cxs/{tenant}/{site}/jobs"
+    site_url = f"https://{host}/{language + '/' if language else ''}{site}"
+    postings = []
+    total = None
+    for page in range(MAX_API_PAGES):
+        payload = {"appliedFacets": {}, "limit": WORKDAY_PAGE_SIZE, "offset": page * WORKDAY_PAGE_SIZE, "searchText": ""}
+        data, failure = fetch_json(api, payload=payload, stats=stats)
+        if data is None:
+            return None, failure
+        try:
+            if total is None:
+                total = int(data.get('total', 0))
+            decoded = decode_workday(data, site_url)
+        except (*UNEXPECTED_RESPONSE_ERRORS, ValueError):
+            return None, unexpected_response()
+        postings.extend(decoded)
+        more = bool(decoded) and len(postings) < total
+        if (on_page and on_page(decoded, more)) or not more:
+            break
+    return postings, None
+
+ATS_FETCHERS = {
+    'greenhouse': fetch_greenhouse,
+    'lever': fetch_lever,
+    'ashby': fetch_ashby,
+    'workday': fetch_workday,
+}
+
+def detect_ats(url, ats=None):
+    """Return (ats name, URL match) for a career site, or (None, None).
+
+    An explicit ats name from config.json wins over guessing from the URL;
+    "html" turns the API off for that site.
+    """
+    if ats == 'html':
+        return None, None
+    for name, pattern in ATS_URL_PATTERNS.items():
+        if ats and name != ats:
+            continue
+        match = pattern.match(url)
+        if match:
+            return name, match
+    return None, None
+
+def api_jobs(postings, site_name, keywords, negative_keywords):
+    """Turn (title, url) pairs from an ATS API into matching jobs."""
+    matches = keyword_matcher(tuple(keywords), tuple(negative_keywords))
+    jobs = []
+    seen_urls = set()
+    for title, url in postings:
+        title = ' '.join(title.split())
+        if url not in seen_urls and matches(title):
+            seen_urls.add(url)
+            jobs.append({'title': title, 'url': url, 'site': site_name})
+    return jobs
@@ -0,0 +1,122 @@
+"""
+Optional Bloom filter in front of the seen-jobs history
+"""
+
+import hashlib
+import math
+import struct
+
+# Optional Bloom filter in front of the history database (config:
+# "bloom_filter": true). It answers "definitely not seen" from a small file,
+# so only possible matches are looked up in the database.
+DEFAULT_BLOOM_FALSE_POSITIVE_RATE = 0.01
+BLOOM_HEADER = struct.Struct('<4sQQQQd32s')
+BLOOM_MAGIC = b'JBF2'
+
+# Every write of seen jobs stores a new random token under this run_info key,
+# in the same transaction (see history.save_history()). A saved filter
+# records the token it was saved with and is rebuilt if the history has
+# been written since: by a run with the filter turned off, or by a run that
+# stopped before saving the filter.
+HISTORY_GENERATION_KEY = "history_generation"
+
+def new_bloom(capacity, fp_rate):
+    """Create an empty Bloom filter sized for capacity IDs at fp_rate."""
+    capacity = max(1, capacity)
+    size = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+    hashes = max(1, round(size / capacity * math.log(2)))
+    return {
+        "bits": bytearray((size + 7) // 8),
+        "size": size,
+        "hashes": hashes,
+        "count": 0,
+        "capacity": capacity,
+        "fp_rate": fp_rate,
+    }
+
+def bloom_hashes(jid):
+    """Two 64-bit hashes of a job ID for double hashing."""
+    digest = int.from_bytes(hashlib.blake2b(jid.encode('utf-8'), digest_size=16).digest(), 'little')
+    return digest & 0xFFFFFFFFFFFFFFFF, (digest >> 64) | 1
+
+def bloom_add(bloom, jid):
+    """Add a job ID to a Bloom filter."""
+    h1, h2 = bloom_hashes(jid)
+    bits, size = bloom["bits"], bloom["size"]
+    for i in range(bloom["hashes"]):
+        pos = (h1 + i * h2) % size
+        bits[pos >> 3] |= 1 << (pos & 7)
+    bloom["count"] += 1
+
+def bloom_might_contain(bloom, jid):
+    """False means the ID was definitely never added."""
+    h1, h2 = bloom_hashes(jid)
+    bits, size = bloom["bits"], bloom["size"]
+    for i in range(bloom["hashes"]):
+        pos = (h1 + i * h2) % size
+        if not bits[pos >> 3] & (1 << (pos & 7)):
+            return False
+    return True
+
+def history_generation(history):
+    """The history database's current generation token ("" before any write)."""
+    row = history.execute("SELECT value FROM run_info WHERE key = ?", (HISTORY_GENERATION_KEY,)).fetchone()
+    return row[0] if row and row[0] else ""
+
+def load_bloom(path, capacity, fp_rate, generation=""):
+    """Load a saved Bloom filter, or None if it is missing or out of date.
+
+    Out of date means sized differently or saved at another generation of
+    the history (see history_generation()).
+    """
+    try:
+        with open(path, 'rb') as f:
+            magic, size, hashes, count, saved_capacity, saved_fp_rate, saved_generation = BLOOM_HEADER.unpack(
+                f.read(BLOOM_HEADER.size)
+            )
+            bits = bytearray(f.read())
+    except (OSError, struct.error):
+        return None
+    if (magic != BLOOM_MAGIC or saved_capacity != capacity or saved_fp_rate != fp_rate
+            or saved_generation.rstrip(b'\0') != generation.encode('ascii')
+            or len(bits) != (size + 7) // 8):
+        return None
+    return {
+        "bits": bits,
+        "size": size,
+        "hashes": hashes,
+        "count": count,
+        "capacity": capacity,
+        "fp_rate": fp_rate,
+    }
+
+def save_bloom(bloom, path, generation=""):
+    """Write the Bloom filter next to the history database.
+
+    generation is the history_generation() the filter is up to date with.
+    """
+    path.parent.mkdir(exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(BLOOM_HEADER.pack(
+            BLOOM_MAGIC, bloom["size"], bloom["hashes"], bloom["count"],
+            bloom["capacity"], bloom["fp_rate"], generation.encode('ascii')
+        ))
+        f.write(bloom["bits"])
+
+def build_bloom(history, capacity, fp_rate):
+    """Build a Bloom filter from every job ID in the history database."""
+    bloom = new_bloom(capacity, fp_rate)
+    for (jid,) in history.execute("SELECT job_id FROM seen_jobs"):
+        bloom_add(bloom, jid)
+    return bloom
+
+def open_bloom(config, history, path, max_jobs, reset=False):
+    """Load or build the Bloom filter if the config turns it on."""
+    if not config.get('bloom_filter'):
+        return None
+    capacity = config.get('history_max_jobs', max_jobs)
+    fp_rate = config.get('bloom_false_positive_rate', DEFAULT_BLOOM_FALSE_POSITIVE_RATE)
+    bloom = None if reset else load_bloom(path, capacity, fp_rate, history_generation(history))
+    if bloom is None:
+        bloom = build_bloom(history, capacity, fp_rate)
+    return bloom
@@ -0,0 +1,62 @@
+"""
+HTTP cache: validators for conditional requests and the job list of every
+page, reused while the page is unchanged
+"""
+
+import hashlib
+import json
+import re
+
+# Page fragments that change on every request without the job list changing
+# (CSRF tokens, nonces, timestamps). Stripped before hashing a page; sites
+# can add their own with "ignore_patterns" in config.json.
+VOLATILE_PATTERNS = [
+    re.compile(r'<meta[^>]+name=["\'][^"\']*(?:csrf|token)[^"\']*["\'][^>]*>', re.IGNORECASE),
+    re.compile(r'<input[^>]+name=["\'][^"\']*(?:csrf|token|authenticity)[^"\']*["\'][^>]*>', re.IGNORECASE),
+    re.compile(r'\bnonce=["\'][^"\']*["\']', re.IGNORECASE),
+    re.compile(r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?'),
+]
+
+# Separates a site's key from the page URL in the cache keys of pages past
+# the first. A tab can't appear in a URL, unlike "#" (single-page app career
+# sites such as https://careers.example.com/#/jobs).
+PAGE_KEY_SEPARATOR = "\t"
+
+def load_http_cache(path, keywords, negative_keywords):
+    """Load cached HTTP validators and job lists from the previous run.
+
+    Cached job lists depend on the keywords, so the cache is discarded
+    whenever they change.
+    """
+    empty = {"keywords": keywords, "negative_keywords": negative_keywords, "sites": {}}
+    if path.exists():
+        try:
+            with open(path, 'r') as f:
+                cache = json.load(f)
+        except:
+            return empty
+        if cache.get("keywords") == keywords and cache.get("negative_keywords") == negative_keywords:
+            cache.setdefault("sites", {})
+            return cache
+    return empty
+
+def save_http_cache(cache, path, career_sites):
+    """Save HTTP validators, dropping sites no longer in the config."""
+    current = {cache_key(site['name'], site['url']) for site in career_sites}
+    cache["sites"] = {k: v for k, v in cache["sites"].items() if k.split(PAGE_KEY_SEPARATOR, 1)[0] in current}
+    path.parent.mkdir(exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(cache, f)
+
+def cache_key(site_name, url, page_url=None):
+    """Key a site's HTTP cache entry by name and URL (and page, past the first)."""
+    key = f"{site_name}|{url}"
+    return f"{key}{PAGE_KEY_SEPARATOR}{page_url}" if page_url and page_url != url else key
+
+def content_hash(html, ignore_patterns=None):
+    """Hash a page with its volatile fragments removed."""
+    for pattern in VOLATILE_PATTERNS:
+        html = pattern.sub('', html)
+    for pattern in ignore_patterns or []:
+        html = re.sub(pattern, '', html)
+    return hashlib.sha256(html.encode('utf-8', 'replace')).hexdigest()
@@ -0,0 +1,387 @@
+"""
+Job extraction from career pages: JSON-LD JobPosting data when a page has
+it, otherwise precompiled scans for links, headings and title-like elements
+"""
+
+import html as html_entities
+import json
+import re
+import signal
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from urllib.parse import urljoin, urlparse
+
+from .matching import keyword_matcher
+
+# Candidate patterns, compiled once. These start with "<" or '"', so re can
+# jump straight to each possible match. A tag's attributes can't run past
+# the next "<", and every repeated part is capped in length, so a page full
+# of unclosed tags or huge attributes costs time in proportion to its size
+# rather than its size squared: a single regex scan can't be interrupted on
+# a fetch thread or on Windows (see cpu_time_limit()), and holds up every
+# other thread while it runs.
+LINK_PATTERN = re.compile(
+    r'<a[^<>]{0,1000}href=["\']([^"\']{0,2000})["\'][^<>]{0,1000}>([^<]{0,1000})</a>', re.IGNORECASE
+)
+HEADING_PATTERN = re.compile(r'<h[23][^<>]{0,1000}>([^<]{1,1000})</h[23]>', re.IGNORECASE)
+JSON_TITLE_PATTERN = re.compile(r'"title"\s{0,100}:\s{0,100}"([^"]{1,1000})"', re.IGNORECASE)
+
+# Class patterns start with a letter, which IGNORECASE would have to test at
+# every position of the page. They run case-sensitively against a lowercased
+# copy instead, unless the page has characters that re.IGNORECASE and
+# str.lower() treat differently. Job listings use title-class elements;
+# the health check's broader count also takes job-class ones.
+TITLE_CLASS_PATTERN = re.compile(r'class="[^"]{0,1000}?title[^"]{0,1000}"[^>]{0,1000}>([^<]{1,1000})<')
+JOB_CLASS_PATTERN = re.compile(r'class="[^"]{0,1000}?job[^"]{0,1000}"[^>]{0,1000}>([^<]{1,1000})<')
+CLASS_PATTERNS = [TITLE_CLASS_PATTERN]
+ALL_JOBS_CLASS_PATTERNS = [TITLE_CLASS_PATTERN, JOB_CLASS_PATTERN]
+CLASS_PATTERNS_NOCASE = {p: re.compile(p.pattern, re.IGNORECASE) for p in ALL_JOBS_CLASS_PATTERNS}
+CASE_FOLD_EXCEPTIONS = ('\u0130', '\u0131', '\u017f')
+
+# CPU seconds a page's extraction may take (config and per-site:
+# "extract_time_budget_seconds", 0 for no limit). A page that takes longer
+# is read with the cheaper fallback patterns below instead. The budget is
+# checked between scans; a scan already running is only cut short in a
+# worker process off Windows (see cpu_time_limit()), which is why the
+# patterns above are capped.
+DEFAULT_EXTRACT_TIME_BUDGET_SECONDS = 5
+
+# Fallback patterns: links and h2/h3 headings only, with every part of a tag
+# capped in length so the work stays proportional to the page size
+FALLBACK_LINK_PATTERN = re.compile(
+    r'<a\s[^<>]{0,500}?href=["\']([^"\'<>]{0,500})["\'][^<>]{0,500}>([^<]{1,200})</a>', re.IGNORECASE
+)
+FALLBACK_HEADING_PATTERN = re.compile(r'<h[23][^<>]{0,200}>([^<]{1,200})</h[23]>', re.IGNORECASE)
+
+# Link texts skipped by extract_all_jobs() as site navigation
+NAVIGATION_LINK_WORDS = ['home', 'about', 'contact', 'login', 'sign in', 'careers home']
+NAVIGATION_TITLE_WORDS = ['home', 'about', 'contact', 'login']
+
+# schema.org JobPosting data embedded in the page. When a page has any, its
+# jobs come from there (with their real URL, date and location) and the
+# pattern scans above are skipped.
+JSON_LD_TAG_PATTERN = re.compile(
+    r'<script[^<>]{0,1000}?type\s{0,100}=\s{0,100}["\']?application/ld\+json["\']?[^<>]{0,1000}>', re.IGNORECASE
+)
+SCRIPT_END_PATTERN = re.compile(r'</script>', re.IGNORECASE)
+
+# "Next page" links, for sites with {"pagination": {"next_link": true}}
+NEXT_TAG_PATTERN = re.compile(
+    r'<(?:a|link)\b[^<>]{0,1000}?(?:\brel\s{0,100}=\s{0,100}["\']?next\b|\baria-label\s{0,100}=\s{0,100}["\']next\b)'
+    r'[^<>]{0,1000}>',
+    re.IGNORECASE
+)
+HREF_PATTERN = re.compile(r'\bhref\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+NEXT_LINK_TEXTS = {'next', 'next page', 'next >', 'next ›', 'next »', '›', '»', 'load more', 'show more', 'more jobs'}
+
+class ExtractionBudgetExceeded(Exception):
+    """A page's extraction ran past its CPU time budget."""
+
+def budget_deadline(seconds):
+    """The current thread's CPU time at which a budget of seconds runs out (None for no limit)."""
+    return time.thread_time() + seconds if seconds else None
+
+def check_budget(deadline):
+    """Raise ExtractionBudgetExceeded once the thread's CPU time passes deadline."""
+    if deadline is not None and time.thread_time() > deadline:
+        raise ExtractionBudgetExceeded()
+
+@contextmanager
+def cpu_time_limit(seconds):
+    """Interrupt the with block with ExtractionBudgetExceeded after seconds of CPU time.
+
+    A single regex scan can only be cut short by a signal, so this needs a
+    CPU timer (not available on Windows) and the main thread, as in a worker
+    process. Elsewhere it does nothing and the budget is only checked
+    between scans (see check_budget()).
+    """
+    if not seconds or not hasattr(signal, 'setitimer') or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    
+    def interrupt(signum, frame):
+        raise ExtractionBudgetExceeded()
+    
+    previous = signal.signal(signal.SIGPROF, interrupt)
+    signal.setitimer(signal.ITIMER_PROF, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, previous)
+
+def find_class_matches(html, patterns=CLASS_PATTERNS, deadline=None):
+    """Return the text after each matching class attribute, pattern by pattern."""
+    if any(ch in html for ch in CASE_FOLD_EXCEPTIONS):
+        texts = []
+        for pattern in patterns:
+            check_budget(deadline)
+            texts.extend(CLASS_PATTERNS_NOCASE[pattern].findall(html))
+        return texts
+    lowered = html.lower()
+    texts = []
+    for pattern in patterns:
+        check_budget(deadline)
+        texts.extend(html[match.start(1):match.end(1)] for match in pattern.finditer(lowered))
+    return texts
+
+def find_candidates(html, class_patterns=CLASS_PATTERNS, deadline=None):
+    """Find job candidates in a page.
+
+    Returns (links, titles): (href, text) pairs for every link, and the text
+    of class-matched elements, h2/h3 headings and JSON "title" fields, in
+    that order. With a deadline (see budget_deadline()), raises
+    ExtractionBudgetExceeded if it passes between scans.
+    """
+    links = LINK_PATTERN.findall(html)
+    titles = find_class_matches(html, class_patterns, deadline)
+    check_budget(deadline)
+    titles += HEADING_PATTERN.findall(html)
+    check_budget(deadline)
+    titles += JSON_TITLE_PATTERN.findall(html)
+    check_budget(deadline)
+    return links, titles
+
+def fallback_candidates(html, stats=None):
+    """find_candidates() for a page over its time budget: links and headings only.
+
+    The page is counted in stats['over_budget'], if given.
+    """
+    if stats is not None:
+        stats['over_budget'] = stats.get('over_budget', 0) + 1
+    return FALLBACK_LINK_PATTERN.findall(html), FALLBACK_HEADING_PATTERN.findall(html)
+
+def absolute_url(href, base_url):
+    """Make a link found on a page absolute."""
+    if href.startswith('/'):
+        parsed = urlparse(base_url)
+        return f"{parsed.scheme}://{parsed.netloc}{href}"
+    elif not href.startswith('http'):
+        return urljoin(base_url, href)
+    return href
+
+def dedupe_by_title(jobs):
+    """Drop jobs whose title (ignoring case) was already listed."""
+    seen_titles = set()
+    unique_jobs = []
+    for job in jobs:
+        if job['title'].lower() not in seen_titles:
+            seen_titles.add(job['title'].lower())
+            unique_jobs.append(job)
+    return unique_jobs
+
+def iter_job_postings(data):
+    """Yield every JobPosting object in decoded JSON-LD, however nested."""
+    if isinstance(data, list):
+        for item in data:
+            yield from iter_job_postings(item)
+    elif isinstance(data, dict):
+        types = data.get('@type')
+        if types == 'JobPosting' or (isinstance(types, list) and 'JobPosting' in types):
+            yield data
+            return
+        for key in ('@graph', 'itemListElement', 'item', 'mainEntity'):
+            if key in data:
+                yield from iter_job_postings(data[key])
+
+def posting_location(posting):
+    """Describe where a JobPosting is, e.g. "Portland, OR" or "Remote"."""
+    if posting.get('jobLocationType') == 'TELECOMMUTE':
+        return "Remote"
+    places = posting.get('jobLocation') or []
+    if isinstance(places, dict):
+        places = [places]
+    names = []
+    for place in places:
+        address = place.get('address', place) if isinstance(place, dict) else place
+        if isinstance(address, dict):
+            address = ", ".join(
+                str(address[part]) for part in ('addressLocality', 'addressRegion', 'addressCountry')
+                if isinstance(address.get(part), (str, int))
+            )
+        if address and isinstance(address, str) and address not in names:
+            names.append(address)
+    return "; ".join(names) or None
+
+def posting_identifier(posting):
+    """Return a JobPosting's identifier value as a string, if it has one."""
+    identifier = posting.get('identifier')
+    if isinstance(identifier, dict):
+        identifier = identifier.get('value')
+    return str(identifier) if isinstance(identifier, (str, int)) else None
+
+def json_ld_blocks(html):
+    """Return the contents of a page's JSON-LD script blocks.
+
+    Each block runs to the next </script>; once there is none, no later
+    block can be closed either, so the search stops there.
+    """
+    blocks = []
+    position = 0
+    while True:
+        tag = JSON_LD_TAG_PATTERN.search(html, position)
+        if not tag:
+            return blocks
+        end = SCRIPT_END_PATTERN.search(html, tag.end())
+        if not end:
+            return blocks
+        blocks.append(html[tag.end():end.start()])
+        position = end.end()
+
+def extract_structured_jobs(html, base_url, site_name, matches, stats=None, deadline=None):
+    """Extract jobs from schema.org JobPosting JSON-LD blocks.
+
+    Only the JSON-LD script blocks are decoded. Returns None if the page
+    has no JobPosting data, so the caller can fall back to the pattern scans.
+    The number of postings found is added to stats['candidates'], if given.
+    """
+    if 'ld+json' not in html and 'LD+JSON' not in html:
+        return None
+    postings = []
+    blocks = json_ld_blocks(html)
+    check_budget(deadline)
+    for block in blocks:
+        try:
+            postings.extend(iter_job_postings(json.loads(block, strict=False)))
+        except (ValueError, RecursionError):
+            # Malformed, or nested too deeply to decode
+            continue
+    if not postings:
+        return None
+    if stats is not None:
+        stats['candidates'] = stats.get('candidates', 0) + len(postings)
+    
+    jobs = []
+    seen = set()
+    for posting in postings:
+        title = posting.get('title') or posting.get('name')
+        if not isinstance(title, str):
+            continue
+        title = ' '.join(html_entities.unescape(title).split())
+        url = posting.get('url')
+        url = urljoin(base_url, url) if isinstance(url, str) else base_url
+        if (title.lower(), url) in seen or not matches(title):
+            continue
+        seen.add((title.lower(), url))
+        date_posted = posting.get('datePosted')
+        jobs.append({
+            'title': title,
+            'url': url,
+            'site': site_name,
+            'date_posted': date_posted if isinstance(date_posted, str) else None,
+            'location': posting_location(posting),
+            'identifier': posting_identifier(posting),
+        })
+    return jobs
+
+def extract_jobs(html, base_url, site_name, keywords, negative_keywords, stats=None, budget=None):
+    """Extract job listings from HTML, preferring JSON-LD JobPosting data.
+
+    If a stats dict is given, the number of candidate titles checked against
+    the keywords is added to stats['candidates']. With a budget (CPU
+    seconds), a page that takes longer is read with fallback_candidates()
+    instead (see cpu_time_limit() for when a single slow scan can be cut
+    short).
+    """
+    jobs = []
+    if not html:
+        return jobs
+    
+    matches = keyword_matcher(tuple(keywords), tuple(negative_keywords))
+    try:
+        with cpu_time_limit(budget):
+            deadline = budget_deadline(budget)
+            structured = extract_structured_jobs(html, base_url, site_name, matches, stats, deadline)
+            if structured is not None:
+                return structured
+            links, titles = find_candidates(html, CLASS_PATTERNS, deadline)
+    except ExtractionBudgetExceeded:
+        links, titles = fallback_candidates(html, stats)
+    if stats is not None:
+        stats['candidates'] = stats.get('candidates', 0) + len(links) + len(titles)
+    
+    for href, text in links:
+        text = text.strip()
+        if len(text) > 10 and matches(text):
+            jobs.append({
+                'title': text[:100],
+                'url': absolute_url(href, base_url),
+                'site': site_name
+            })
+    
+    # Also check for job titles in common patterns
+    for match in titles:
+        text = match.strip()
+        if len(text) > 10 and len(text) < 150 and matches(text):
+            jobs.append({
+                'title': text,
+                'url': base_url,
+                'site': site_name
+            })
+    
+    return dedupe_by_title(jobs)
+
+def extract_compressed(body, base_url, site_name, keywords, negative_keywords, budget=None):
+    """extract_jobs() for a zlib-compressed UTF-8 page, run in a worker process.
+
+    Returns (jobs, stats), with the time spent in stats['extract_seconds'].
+    """
+    started = time.perf_counter()
+    stats = {}
+    jobs = extract_jobs(zlib.decompress(body).decode('utf-8'), base_url, site_name, keywords, negative_keywords,
+                        stats, budget)
+    stats['extract_seconds'] = time.perf_counter() - started
+    return jobs, stats
+
+def extract_all_jobs(html, base_url, stats=None, budget=None):
+    """Extract ALL job listings from HTML (no keyword filtering).
+
+    stats and budget work as for extract_jobs().
+    """
+    jobs = []
+    if not html:
+        return jobs
+    
+    try:
+        with cpu_time_limit(budget):
+            links, titles = find_candidates(html, ALL_JOBS_CLASS_PATTERNS, budget_deadline(budget))
+    except ExtractionBudgetExceeded:
+        links, titles = fallback_candidates(html, stats)
+    
+    for href, text in links:
+        text = text.strip()
+        # Very lenient filter - just needs to look like it could be a job title
+        if len(text) > 10 and len(text) < 200:
+            # Skip obvious navigation items
+            if any(skip in text.lower() for skip in NAVIGATION_LINK_WORDS):
+                continue
+            jobs.append({
+                'title': text[:100],
+                'url': absolute_url(href, base_url)
+            })
+    
+    # Also check for job titles in common patterns
+    for match in titles:
+        text = match.strip()
+        if len(text) > 10 and len(text) < 150:
+            if any(skip in text.lower() for skip in NAVIGATION_TITLE_WORDS):
+                continue
+            jobs.append({
+                'title': text,
+                'url': base_url
+            })
+    
+    return dedupe_by_title(jobs)
+
+def find_next_link(html, page_url):
+    """Return the absolute URL of a page's "next page" link, if it has one."""
+    for tag in NEXT_TAG_PATTERN.findall(html):
+        href = HREF_PATTERN.search(tag)
+        if href:
+            return urljoin(page_url, html_entities.unescape(href.group(1)))
+    for href, text in LINK_PATTERN.findall(html):
+        if ' '.join(text.split()).lower() in NEXT_LINK_TEXTS and not href.startswith(('#', 'javascript:')):
+            return urljoin(page_url, html_entities.unescape(href))
+    return None
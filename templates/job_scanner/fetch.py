@@ -0,0 +1,334 @@
+"""
+HTTP fetching shared by every scanner: one pooled session, per-host
+politeness limits, streamed reads with a size cap, and failure classification
+"""
+
+import codecs
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+import requests.adapters
+
+# Number of career sites fetched at the same time (config: "fetch_workers")
+DEFAULT_FETCH_WORKERS = 8
+
+# Browser-like headers sent with every request
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+    'Cache-Control': 'max-age=0',
+}
+
+# Connection pool sizing: hosts kept open, and connections kept per host
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = DEFAULT_FETCH_WORKERS
+
+# Politeness limits for sites sharing a host, e.g. myworkdayjobs.com:
+# a token bucket refilling at "host_requests_per_second" up to "host_burst"
+# requests, and at most "host_max_connections" requests in flight. A 429 or
+# 503 with Retry-After pauses the host: requests to it fail at once with a
+# "paused" failure instead of waiting in a fetch worker, and the scan puts
+# its sites back in the queue until the pause is over if it is at most
+# MAX_RETRY_AFTER_SECONDS (see scanner.check_all_sites()). "fetch_workers"
+# caps concurrency overall.
+DEFAULT_HOST_REQUESTS_PER_SECOND = 1.0
+DEFAULT_HOST_BURST = 2
+DEFAULT_HOST_MAX_CONNECTIONS = 2
+MAX_RETRY_AFTER_SECONDS = 120
+
+# HTTP statuses worth retrying: the site is busy or briefly broken
+TRANSIENT_HTTP_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# Pages are read in chunks and decoded as they arrive, and reading stops
+# after "max_page_bytes" (per site or global) so a wrong URL serving a huge
+# page or a file download can't stall the scan. Responses that are clearly
+# not web pages (PDFs, images, zip files) are not read at all.
+DEFAULT_MAX_PAGE_BYTES = 5_000_000
+READ_CHUNK_BYTES = 64 * 1024
+PAGE_CONTENT_TYPES = ('html', 'xml', 'text', 'json')
+
+# Returned by fetch_page() when the server confirms the cached copy is current
+NOT_MODIFIED = object()
+
+_session = None
+_session_lock = threading.Lock()
+
+_host_limits = {}
+_host_limits_lock = threading.Lock()
+_host_settings = {
+    "rate": DEFAULT_HOST_REQUESTS_PER_SECOND,
+    "burst": DEFAULT_HOST_BURST,
+    "connections": DEFAULT_HOST_MAX_CONNECTIONS,
+}
+
+def get_session():
+    """Return the shared HTTP session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update(REQUEST_HEADERS)
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=POOL_CONNECTIONS,
+                pool_maxsize=POOL_MAXSIZE
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+    return _session
+
+def configure_host_limits(config):
+    """Apply the per-host politeness settings from config.json."""
+    with _host_limits_lock:
+        _host_settings["rate"] = config.get('host_requests_per_second', DEFAULT_HOST_REQUESTS_PER_SECOND)
+        _host_settings["burst"] = config.get('host_burst', DEFAULT_HOST_BURST)
+        _host_settings["connections"] = config.get('host_max_connections', DEFAULT_HOST_MAX_CONNECTIONS)
+        _host_limits.clear()
+
+def host_connections():
+    """How many connections one host may have open at once."""
+    return max(1, _host_settings["connections"])
+
+def url_host(url):
+    """The host part of a URL, used to group sites for rate limiting."""
+    return urlparse(url).netloc.lower()
+
+def host_limit(url):
+    """Return the rate limit state for a URL's host, creating it on first use."""
+    return host_state(url_host(url))
+
+def host_state(host):
+    """Return the rate limit state for a host, creating it on first use."""
+    with _host_limits_lock:
+        limit = _host_limits.get(host)
+        if limit is None:
+            limit = {
+                "tokens": _host_settings["burst"],
+                "updated": time.monotonic(),
+                "paused_until": 0,
+                "lock": threading.Lock(),
+                "connections": threading.Semaphore(_host_settings["connections"]),
+            }
+            _host_limits[host] = limit
+    return limit
+
+def wait_for_host(limit):
+    """Block until the host's token bucket allows another request.
+
+    Returns None once a request may go ahead, or the seconds left if the
+    host is paused by a Retry-After (without waiting for them).
+    """
+    rate, burst = _host_settings["rate"], _host_settings["burst"]
+    while True:
+        with limit["lock"]:
+            now = time.monotonic()
+            limit["tokens"] = min(burst, limit["tokens"] + (now - limit["updated"]) * rate)
+            limit["updated"] = now
+            paused = limit["paused_until"] - now
+            if paused > 0:
+                return paused
+            if limit["tokens"] >= 1:
+                limit["tokens"] -= 1
+                return None
+            wait = (1 - limit["tokens"]) / rate
+        time.sleep(wait)
+
+def host_delay(host):
+    """Seconds until a host takes another request: a pause, or its token bucket refilling."""
+    limit = host_state(host)
+    rate, burst = _host_settings["rate"], _host_settings["burst"]
+    with limit["lock"]:
+        now = time.monotonic()
+        tokens = min(burst, limit["tokens"] + (now - limit["updated"]) * rate)
+        return max(limit["paused_until"] - now, (1 - tokens) / rate, 0)
+
+def paused_failure(seconds):
+    """The failure for a request not made because its host is paused."""
+    failure = classify_failure()
+    failure.update(kind='paused', transient=True, retry_after=seconds,
+                   description=f"site asked to wait {seconds:.0f}s")
+    return failure
+
+def retry_after_seconds(response):
+    """Seconds a 429/503 response asks us to wait, or None."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def classify_failure(error=None, response=None):
+    """Describe why a fetch failed.
+
+    Returns a dict with 'kind' (timeout, connect, dns, tls, redirects, http
+    or error; fetch_page() also reports content and paused), the HTTP 'status' if any, a short 'description', whether the
+    problem is 'transient' (worth retrying, a flaky site rather than a
+    broken one) and any 'retry_after' seconds the server asked for.
+    """
+    failure = {'kind': 'error', 'status': None, 'transient': False, 'retry_after': None}
+    if response is not None:
+        failure.update(kind='http', status=response.status_code,
+                       transient=response.status_code in TRANSIENT_HTTP_STATUSES,
+                       description=f"HTTP {response.status_code} {response.reason or ''}".strip())
+        if response.status_code in (429, 503):
+            failure['retry_after'] = retry_after_seconds(response)
+    elif isinstance(error, requests.exceptions.Timeout):
+        failure.update(kind='timeout', transient=True, description="timed out")
+    elif isinstance(error, requests.exceptions.SSLError):
+        failure.update(kind='tls', description="secure connection (TLS) failed")
+    elif isinstance(error, requests.exceptions.ConnectionError):
+        if any(marker in repr(error) for marker in ('NameResolution', 'getaddrinfo', 'Name or service not known')):
+            failure.update(kind='dns', description="site address not found (DNS)")
+        else:
+            failure.update(kind='connect', transient=True, description="could not connect")
+    elif isinstance(error, requests.exceptions.TooManyRedirects):
+        failure.update(kind='redirects', description="too many redirects")
+    else:
+        failure['description'] = type(error).__name__ if error else "empty page"
+    return failure
+
+def read_body(response, max_bytes=DEFAULT_MAX_PAGE_BYTES, stats=None):
+    """Read and decode a streamed response, stopping after max_bytes.
+
+    Returns (text, truncated). Chunks are decoded incrementally, so a
+    character split between chunks is still decoded correctly. The number
+    of bytes read is added to stats['bytes'] if a stats dict is given.
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+    except LookupError:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    parts = []
+    remaining = max_bytes
+    truncated = False
+    for chunk in response.iter_content(READ_CHUNK_BYTES):
+        if len(chunk) > remaining:
+            chunk = chunk[:remaining]
+            truncated = True
+        parts.append(decoder.decode(chunk))
+        remaining -= len(chunk)
+        if truncated:
+            break
+    parts.append(decoder.decode(b'', final=True))
+    if stats is not None:
+        stats['bytes'] = stats.get('bytes', 0) + max_bytes - remaining
+    return "".join(parts), truncated
+
+def http_failure(response, limit):
+    """Classify an HTTP error response, pausing the host if it asked to wait."""
+    failure = classify_failure(response=response)
+    if failure['retry_after'] is not None:
+        with limit["lock"]:
+            limit["paused_until"] = max(limit["paused_until"], time.monotonic() + failure['retry_after'])
+    return failure
+
+def fetch_page(url, timeout=15, validators=None, max_bytes=DEFAULT_MAX_PAGE_BYTES, stats=None):
+    """Fetch a webpage and return (content, validators, failure, truncated).
+
+    If validators from an earlier fetch are given, the request is made
+    conditional and content is NOT_MODIFIED when the server answers 304.
+    Content is None if the page could not be fetched, and failure then
+    says why (see classify_failure()). At most max_bytes of the body are
+    read; truncated says whether the rest was cut off. If a stats dict is
+    given, the 'seconds' the request took (not counting any wait for the
+    host's rate limit) and the body 'bytes' read are added to it.
+    """
+    headers = {}
+    if validators:
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+    limit = host_limit(url)
+    paused = wait_for_host(limit)
+    if paused is not None:
+        return None, None, paused_failure(paused), False
+    try:
+        with limit["connections"]:
+            started = time.monotonic()
+            try:
+                with get_session().get(url, headers=headers, timeout=timeout, stream=True) as response:
+                    if response.status_code == 304 and validators:
+                        return NOT_MODIFIED, validators, None, False
+                    if response.status_code >= 400:
+                        return None, None, http_failure(response, limit), False
+                    content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+                    if content_type and not any(kind in content_type for kind in PAGE_CONTENT_TYPES):
+                        failure = classify_failure()
+                        failure.update(kind='content', description=f"not a web page ({content_type})")
+                        return None, None, failure, False
+                    text, truncated = read_body(response, max_bytes, stats)
+            finally:
+                if stats is not None:
+                    stats['seconds'] = stats.get('seconds', 0) + time.monotonic() - started
+    except requests.exceptions.RequestException as e:
+        return None, None, classify_failure(error=e), False
+    
+    return text, {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+    }, None, truncated
+
+def fetch_json(url, timeout=15, payload=None, max_bytes=DEFAULT_MAX_PAGE_BYTES, stats=None):
+    """Fetch a JSON API response and return (data, failure).
+
+    Sends a POST with the payload as JSON if one is given. A response that
+    is not JSON, or is longer than max_bytes, is a permanent failure.
+    stats works as for fetch_page().
+    """
+    limit = host_limit(url)
+    paused = wait_for_host(limit)
+    if paused is not None:
+        return None, paused_failure(paused)
+    try:
+        with limit["connections"]:
+            started = time.monotonic()
+            try:
+                if payload is None:
+                    response = get_session().get(url, headers={'Accept': 'application/json'},
+                                                 timeout=timeout, stream=True)
+                else:
+                    response = get_session().post(url, json=payload, headers={'Accept': 'application/json'},
+                                                  timeout=timeout, stream=True)
+                with response:
+                    if response.status_code >= 400:
+                        return None, http_failure(response, limit)
+                    text, truncated = read_body(response, max_bytes, stats)
+            finally:
+                if stats is not None:
+                    stats['seconds'] = stats.get('seconds', 0) + time.monotonic() - started
+    except requests.exceptions.RequestException as e:
+        return None, classify_failure(error=e)
+    
+    failure = classify_failure()
+    if truncated:
+        failure['description'] = "API response too large"
+        return None, failure
+    try:
+        return json.loads(text), None
+    except ValueError:
+        failure['description'] = "unexpected API response"
+        return None, failure
@@ -0,0 +1,263 @@
+"""
+The site health check: reads every career site once and reports how many
+jobs each one lists, to catch sites that changed or need JavaScript
+
+Sites are checked in parallel, and a page the monitor downloaded recently is
+read from its fetch snapshot instead of being downloaded again. Sites on a
+known applicant tracking system are read through its JSON API, like the
+monitor does. Besides the
+printed summary, a JSON health report is written for other tools.
+
+app is a dict of the entry script's file locations and banner (see
+job_test_template.py).
+"""
+
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from .ats import ATS_FETCHERS, detect_ats
+from .cache import cache_key
+from .extract import DEFAULT_EXTRACT_TIME_BUDGET_SECONDS, extract_all_jobs
+from .fetch import (DEFAULT_FETCH_WORKERS, DEFAULT_MAX_PAGE_BYTES, classify_failure, configure_host_limits,
+                    fetch_page)
+from .matching import keyword_matcher
+from .profiling import finish_profile, start_profiler
+from .scanner import load_config
+from .snapshot import DEFAULT_SNAPSHOT_MAX_AGE_MINUTES, load_snapshot, snapshot_page
+
+def api_listing(postings, site_name):
+    """Turn (title, url) pairs from an ATS API into jobs, whether they match or not."""
+    jobs = {}
+    for title, url in postings:
+        jobs.setdefault(url, {'title': ' '.join(title.split()), 'url': url, 'site': site_name})
+    return list(jobs.values())
+
+def page_html(site, result, snapshot, max_age_minutes, max_bytes):
+    """Read a site's page from the snapshot or the web, noting where it came from in result.
+
+    Returns None, with result['failure'] set, if the page could not be loaded.
+    """
+    name, url = site['name'], site['url']
+    stored = snapshot_page(snapshot, cache_key(name, url), max_age_minutes) if snapshot else None
+    if stored:
+        html, entry = stored
+        result.update(source="snapshot", fetched_at=entry['fetched_at'], seconds=entry['seconds'],
+                      bytes=entry['bytes'], truncated=entry['truncated'])
+        return html
+    stats = {}
+    html, _, failure, result['truncated'] = fetch_page(
+        url, max_bytes=site.get('max_page_bytes', max_bytes), stats=stats
+    )
+    result.update(source="fetched", seconds=round(stats.get('seconds', 0), 3), bytes=stats.get('bytes', 0))
+    if failure or not html:
+        result['failure'] = failure or classify_failure()
+        return None
+    return html
+
+def test_site(site, keywords, snapshot=None, max_age_minutes=0, max_bytes=DEFAULT_MAX_PAGE_BYTES,
+              extract_budget=DEFAULT_EXTRACT_TIME_BUDGET_SECONDS):
+    """Test a single career site (its config.json entry).
+
+    Returns a dict with the job counts, an example job, whether the site
+    'failed' and the 'failure' if it could not be loaded, plus where the
+    page came from ('source': "snapshot", "fetched" or "api"), when it
+    was fetched, how many 'seconds' that took and its size in 'bytes'.
+    'over_budget' is set when the page took too long to read and the
+    quick scan was used (see extract_jobs()). Sites on a known applicant
+    tracking system are read through its API, falling back to the page if
+    the API call fails for good (see detect_ats()).
+    """
+    name, url = site['name'], site['url']
+    result = {
+        'name': name,
+        'url': url,
+        'total_jobs': 0,
+        'matching_jobs': 0,
+        'example': None,
+        'failed': True,
+        'failure': None,
+        'source': "fetched",
+        'fetched_at': datetime.now().isoformat(timespec='seconds'),
+        'seconds': None,
+        'bytes': 0,
+        'truncated': False,
+        'over_budget': False,
+    }
+    
+    all_jobs = None
+    ats_name, match = detect_ats(url, site.get('ats'))
+    if ats_name:
+        stats = {}
+        postings, failure = ATS_FETCHERS[ats_name](match, None, stats)
+        result.update(source="api", seconds=round(stats.get('seconds', 0), 3), bytes=stats.get('bytes', 0))
+        if postings is not None:
+            all_jobs = api_listing(postings, name)
+        elif failure['transient']:
+            result['failure'] = failure
+            return result
+    
+    if all_jobs is None:
+        html = page_html(site, result, snapshot, max_age_minutes, max_bytes)
+        if html is None:
+            return result
+        stats = {}
+        all_jobs = extract_all_jobs(html, url, stats, site.get('extract_time_budget_seconds', extract_budget))
+        result['over_budget'] = bool(stats.get('over_budget'))
+    
+    # Filter for keyword matches
+    matches = keyword_matcher(tuple(keywords))
+    matching_jobs = [j for j in all_jobs if matches(j['title'])]
+    
+    if all_jobs:
+        result.update(
+            total_jobs=len(all_jobs),
+            matching_jobs=len(matching_jobs),
+            example=matching_jobs[0] if matching_jobs else all_jobs[0],
+            failed=False
+        )
+    return result
+
+def print_site(result):
+    """Print one site's health check result."""
+    name, url = result['name'], result['url']
+    print(f"\n{name}")
+    print("-" * len(name))
+    
+    if result['failure']:
+        print(f"❌ Failed to load ({result['failure']['description']})")
+        print(f"   Manual check: {url}")
+        return
+    
+    if result['total_jobs'] == 0 and result['source'] == "api":
+        print("⚠️  0 jobs listed by the job board's API (board may be empty or moved)")
+        print(f"   Manual check: {url}")
+        return
+    
+    if result['total_jobs'] == 0:
+        print(f"⚠️  0 jobs found (site may have changed or uses JavaScript)")
+        print(f"   Manual check: {url}")
+        return
+    
+    source = {"snapshot": "from the monitor's last fetch", "api": "job board API"}.get(result['source'], "fetched")
+    print(f"✓ {result['total_jobs']} total jobs found | {result['matching_jobs']} match your keywords "
+          f"({source}: {result['seconds']:.2f}s, {result['bytes'] / 1000:.1f} KB)")
+    if result['over_budget']:
+        print("   ⏱️  Page too slow to read fully - quick scan used, some jobs may be missing")
+    
+    # Show one example
+    example = result['example']
+    if result['matching_jobs']:
+        print(f"   Example: \"{example['title']}\"")
+        print(f"   {example['url']}")
+    else:
+        # Show a non-matching example so they can verify site is working
+        print(f"   (No keyword matches, but site is working)")
+        print(f"   Example job: \"{example['title']}\"")
+
+def write_health_report(results, path):
+    """Write the machine-readable health report (JSON)."""
+    report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'summary': {
+            'sites': len(results),
+            'working': sum(not r['failed'] for r in results),
+            'failed': sum(r['failed'] for r in results),
+            'from_snapshot': sum(r['source'] == "snapshot" for r in results),
+            'from_api': sum(r['source'] == "api" for r in results),
+            'total_jobs': sum(r['total_jobs'] for r in results),
+            'matching_jobs': sum(r['matching_jobs'] for r in results),
+        },
+        'sites': [
+            {
+                'name': r['name'],
+                'url': r['url'],
+                'status': "failed" if r['failure'] else "no_jobs" if r['failed'] else "ok",
+                'failure': r['failure'] and {
+                    'kind': r['failure']['kind'],
+                    'status': r['failure']['status'],
+                    'transient': r['failure']['transient'],
+                    'description': r['failure']['description'],
+                },
+                'total_jobs': r['total_jobs'],
+                'matching_jobs': r['matching_jobs'],
+                'latency_ms': None if r['seconds'] is None else round(r['seconds'] * 1000),
+                'bytes': r['bytes'],
+                'truncated': r['truncated'],
+                'over_budget': r['over_budget'],
+                'source': r['source'],
+                'fetched_at': r['fetched_at'],
+            }
+            for r in results
+        ],
+    }
+    path.parent.mkdir(exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+def main(app):
+    """Main entry point."""
+    fresh = "--fresh" in sys.argv
+    profile = "--profile" in sys.argv
+    
+    print(f"\n{app['banner']}")
+    print("=" * 60)
+    print("Testing all career sites...")
+    print("=" * 60)
+    
+    config = load_config(app["config_file"])
+    configure_host_limits(config)
+    max_age = 0 if fresh else config.get('snapshot_max_age_minutes', DEFAULT_SNAPSHOT_MAX_AGE_MINUTES)
+    snapshot = load_snapshot(app["snapshot_dir"])
+    max_bytes = config.get('max_page_bytes', DEFAULT_MAX_PAGE_BYTES)
+    extract_budget = config.get('extract_time_budget_seconds', DEFAULT_EXTRACT_TIME_BUDGET_SECONDS)
+    
+    results = []
+    workers = max(1, config.get('fetch_workers', DEFAULT_FETCH_WORKERS))
+    profiler = start_profiler() if profile else None
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        checks = executor.map(
+            lambda site: test_site(site, config['keywords'], snapshot, max_age, max_bytes, extract_budget),
+            config['career_sites']
+        )
+        for result in checks:
+            print_site(result)
+            results.append(result)
+    
+    # Summary
+    print("\n" + "=" * 60)
+    print("SUMMARY")
+    print("=" * 60)
+    
+    working = [r for r in results if not r['failed'] and r['total_jobs'] > 0]
+    failed = [r for r in results if r['failed'] or r['total_jobs'] == 0]
+    
+    print(f"\n✓ {len(working)} sites working")
+    print(f"❌ {len(failed)} sites need attention")
+    
+    total_jobs = sum(r['total_jobs'] for r in results)
+    total_matches = sum(r['matching_jobs'] for r in results)
+    
+    print(f"\n📊 {total_jobs} total jobs across all sites")
+    print(f"🎯 {total_matches} jobs match your keywords")
+    
+    reused = sum(r['source'] == "snapshot" for r in results)
+    if reused:
+        print(f"♻️  {reused} site(s) read from the monitor's last fetch (use --fresh to re-download)")
+    
+    if failed:
+        print(f"\n⚠️  Failed sites:")
+        for r in failed:
+            print(f"   • {r['name']}")
+            print(f"     {r['url']}")
+    
+    write_health_report(results, app["report_file"])
+    print(f"\n📄 Health report saved to: {app['report_file']}")
+    
+    if profiler is not None:
+        finish_profile(profiler, app["profile_dir"])
+    
+    print("\n" + "=" * 60)
+    print("Health check complete!")
+    print("=" * 60)
@@ -0,0 +1,153 @@
+"""
+Seen-jobs history kept in SQLite, so each run only reports new jobs
+"""
+
+import json
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from .bloom import HISTORY_GENERATION_KEY, bloom_might_contain
+
+# Seen jobs are forgotten once they have not been on any page for this many
+# days (config: "history_retention_days"), oldest first if the history grows
+# past the size limit (config: "history_max_jobs")
+DEFAULT_HISTORY_RETENTION_DAYS = 180
+DEFAULT_HISTORY_MAX_JOBS = 200000
+
+def load_history(db_path, json_path=None, run_key="last_run"):
+    """Open the seen-jobs database, creating it if needed.
+
+    Job IDs from an old JSON history file at json_path are imported the
+    first time, and the file is renamed with a .bak suffix.
+    """
+    db_path.parent.mkdir(exist_ok=True)
+    # Workers check paginated sites against the history, under seen_checker()'s lock
+    history = sqlite3.connect(db_path, check_same_thread=False)
+    history.executescript("""
+        CREATE TABLE IF NOT EXISTS seen_jobs (
+            job_id TEXT PRIMARY KEY,
+            site TEXT NOT NULL,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS seen_jobs_by_site ON seen_jobs (site, last_seen);
+        CREATE INDEX IF NOT EXISTS seen_jobs_by_last_seen ON seen_jobs (last_seen);
+        CREATE TABLE IF NOT EXISTS run_info (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """)
+    if json_path is not None and json_path.exists():
+        migrate_json_history(history, json_path, run_key)
+    return history
+
+def migrate_json_history(history, json_path, run_key="last_run"):
+    """Import seen job IDs from the old JSON history file."""
+    try:
+        with open(json_path, 'r') as f:
+            old = json.load(f)
+    except:
+        old = {}
+    seen = old.get(run_key) or datetime.now().isoformat(timespec='seconds')
+    with history:
+        history.executemany(
+            "INSERT OR IGNORE INTO seen_jobs (job_id, site, first_seen, last_seen) VALUES (?, ?, ?, ?)",
+            [(jid, jid.split('|', 1)[0], seen, seen) for jid in old.get("seen_jobs", [])]
+        )
+        set_run_info(history, HISTORY_GENERATION_KEY, uuid.uuid4().hex)
+        if old.get(run_key):
+            set_run_info(history, run_key, old[run_key])
+    json_path.replace(json_path.with_name(json_path.name + ".bak"))
+
+def get_run_info(history, key):
+    """Read a value such as the last run time from the history database."""
+    row = history.execute("SELECT value FROM run_info WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+def set_run_info(history, key, value):
+    """Store a value such as the last run time in the history database."""
+    history.execute(
+        "INSERT INTO run_info (key, value) VALUES (?, ?) "
+        "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+        (key, value)
+    )
+
+def clear_history(history):
+    """Forget every seen job."""
+    with history:
+        history.execute("DELETE FROM seen_jobs")
+        history.execute("DELETE FROM run_info")
+
+def find_seen_ids(history, job_ids, bloom=None, chunk_size=500):
+    """Return which of the given job IDs are already in the history.
+
+    With a Bloom filter, IDs it rules out are never looked up.
+    """
+    job_ids = list(job_ids)
+    if bloom is not None:
+        job_ids = [jid for jid in job_ids if bloom_might_contain(bloom, jid)]
+    seen = set()
+    for start in range(0, len(job_ids), chunk_size):
+        chunk = job_ids[start:start + chunk_size]
+        placeholders = ",".join("?" * len(chunk))
+        rows = history.execute(
+            f"SELECT job_id FROM seen_jobs WHERE job_id IN ({placeholders})", chunk
+        )
+        seen.update(row[0] for row in rows)
+    return seen
+
+def seen_checker(history, bloom=None):
+    """Return a thread-safe function telling which job IDs were seen before."""
+    lock = threading.Lock()
+    def known_ids(job_ids):
+        with lock:
+            return find_seen_ids(history, job_ids, bloom)
+    return known_ids
+
+def save_history(history, jobs, run_key="last_run", unread_sites=()):
+    """Record jobs seen this run, refreshing last-seen times of known jobs.
+
+    unread_sites names the sites whose listing was not read to the end
+    (it stopped at known jobs). Every job remembered for them counts as
+    seen, since the pages skipped still hold them; otherwise they would be
+    pruned and reported as new the next time the listing is read further.
+    Also starts a new history generation, so a Bloom filter saved before
+    this write is rebuilt (see bloom.py).
+    """
+    now = datetime.now().isoformat(timespec='seconds')
+    with history:
+        history.executemany(
+            "UPDATE seen_jobs SET last_seen = ? WHERE site = ?",
+            [(now, site) for site in unread_sites]
+        )
+        history.executemany(
+            "INSERT INTO seen_jobs (job_id, site, first_seen, last_seen) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (job_id) DO UPDATE SET last_seen = excluded.last_seen",
+            [(job_id(job['site'], job['title'], job['url']), job['site'], now, now) for job in jobs]
+        )
+        set_run_info(history, run_key, datetime.now().isoformat())
+        set_run_info(history, HISTORY_GENERATION_KEY, uuid.uuid4().hex)
+
+def prune_history(history, retention_days, max_jobs):
+    """Forget jobs not seen for retention_days, then the oldest beyond max_jobs.
+
+    Both deletes walk the last_seen index, so nothing is loaded or re-sorted.
+    Returns the number of jobs removed.
+    """
+    cutoff = (datetime.now() - timedelta(days=retention_days)).isoformat(timespec='seconds')
+    with history:
+        removed = history.execute("DELETE FROM seen_jobs WHERE last_seen < ?", (cutoff,)).rowcount
+        excess = history.execute("SELECT COUNT(*) FROM seen_jobs").fetchone()[0] - max_jobs
+        if excess > 0:
+            removed += history.execute(
+                "DELETE FROM seen_jobs WHERE job_id IN "
+                "(SELECT job_id FROM seen_jobs ORDER BY last_seen LIMIT ?)",
+                (excess,)
+            ).rowcount
+    return removed
+
+def job_id(site_name, title, url=""):
+    """Create a unique identifier for a job."""
+    return f"{site_name}|{title}|{url}"[:200]
@@ -0,0 +1,48 @@
+"""
+Keyword matching: every keyword list is compiled once into a single regex
+"""
+
+import re
+from functools import lru_cache
+
+def keyword_pattern(words):
+    """Compile lowercased words into one regex, sharing prefixes like a trie.
+
+    Returns None for an empty list, which matches nothing.
+    """
+    if not words:
+        return None
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word.lower():
+            node = node.setdefault(ch, {})
+        node[''] = True
+    
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        if len(branches) == 1 and '' not in node:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')' + ('?' if '' in node else '')
+    
+    return re.compile(build(trie))
+
+@lru_cache(maxsize=None)
+def keyword_matcher(keywords, negative_keywords=()):
+    """Build a keyword test for tuples of keywords, compiled once per list."""
+    include = keyword_pattern(keywords)
+    exclude = keyword_pattern(negative_keywords)
+    
+    def matches(text):
+        text_lower = text.lower()
+        if exclude is not None and exclude.search(text_lower):
+            return False
+        return include is not None and include.search(text_lower) is not None
+    
+    return matches
+
+def matches_keywords(text, keywords, negative_keywords=()):
+    """Check if text contains target keywords and no negative keywords."""
+    return keyword_matcher(tuple(keywords), tuple(negative_keywords))(text)
@@ -0,0 +1,77 @@
+"""
+Run metrics: what each scan cost, by stage and by site, appended as one JSON
+line per run so scan cost can be trended over time
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Runs kept in the metrics file (config: "metrics_max_runs")
+DEFAULT_METRICS_MAX_RUNS = 365
+
+def new_run_metrics():
+    """Start the metrics record for one run."""
+    return {"started": time.perf_counter(), "run_at": datetime.now().isoformat(timespec='seconds'),
+            "stages": {}}
+
+@contextmanager
+def timed_stage(metrics, stage):
+    """Add the time spent inside the with block to a stage's total."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics["stages"][stage] = metrics["stages"].get(stage, 0) + time.perf_counter() - started
+
+def site_metrics(site, result):
+    """The metrics entry for one site's check_site() result."""
+    stats = result.get('stats', {})
+    failure = result['failure']
+    return {
+        "name": site['name'],
+        "pages": result['pages'],
+        "attempts": result.get('attempts', 1),
+        "fetch_seconds": round(stats.get('seconds', 0), 3),
+        "bytes": stats.get('bytes', 0),
+        "extract_seconds": round(stats.get('extract_seconds', 0), 4),
+        "candidates": stats.get('candidates', 0),
+        "over_budget": stats.get('over_budget', 0),
+        "matches": len(result['jobs']),
+        "failure": failure and failure['kind'],
+        "status": failure and failure['status'],
+    }
+
+def finish_run_metrics(metrics, sites, new_jobs):
+    """Turn the collected metrics into the record written to the file."""
+    total_seconds = time.perf_counter() - metrics["started"]
+    return {
+        "run_at": metrics["run_at"],
+        "seconds": round(total_seconds, 3),
+        "stages": {stage: round(seconds, 4) for stage, seconds in metrics["stages"].items()},
+        "sites_checked": len(sites),
+        "sites_failed": sum(site['failure'] is not None for site in sites),
+        "sites_over_budget": sum(site['over_budget'] > 0 for site in sites),
+        "fetch_seconds": round(sum(site['fetch_seconds'] for site in sites), 3),
+        "bytes": sum(site['bytes'] for site in sites),
+        "extract_seconds": round(sum(site['extract_seconds'] for site in sites), 4),
+        "candidates": sum(site['candidates'] for site in sites),
+        "matches": sum(site['matches'] for site in sites),
+        "new_jobs": new_jobs,
+        "sites": sites,
+    }
+
+def write_run_metrics(record, path, max_runs=DEFAULT_METRICS_MAX_RUNS):
+    """Append a run's record to the JSON lines file, keeping the last max_runs."""
+    path.parent.mkdir(exist_ok=True)
+    lines = []
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    if len(lines) >= max_runs:
+        lines = lines[len(lines) - max_runs + 1:] if max_runs > 1 else []
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + "\n")
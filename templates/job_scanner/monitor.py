@@ -0,0 +1,252 @@
+"""
+The job monitor's command line: one scan per run, or a daemon that checks
+each site on its own schedule
+
+app is a dict of the entry script's file locations and wording (see
+job_monitor_template.py).
+"""
+
+import random
+import sys
+import time
+from datetime import datetime
+
+from .bloom import bloom_add, build_bloom, history_generation, open_bloom, save_bloom
+from .cache import cache_key, load_http_cache, save_http_cache
+from .fetch import DEFAULT_MAX_PAGE_BYTES, configure_host_limits
+from .history import (DEFAULT_HISTORY_MAX_JOBS, DEFAULT_HISTORY_RETENTION_DAYS, clear_history, find_seen_ids,
+                      get_run_info, job_id, load_history, prune_history, save_history, seen_checker,
+                      set_run_info)
+from .metrics import (DEFAULT_METRICS_MAX_RUNS, finish_run_metrics, new_run_metrics, site_metrics,
+                      timed_stage, write_run_metrics)
+from .notify import finish_email_delivery, send_email, start_email_delivery
+from .profiling import finish_profile, start_profiler
+from .report import create_failed_sites_bat, format_email_body, format_results
+from .scanner import iter_scan, load_config
+from .snapshot import load_snapshot, save_snapshot
+
+# Daemon mode (--daemon): how often each site is checked (config and per-site:
+# "check_interval_minutes"), randomized by this fraction either way (config:
+# "check_interval_jitter"), and how often config.json is checked for edits
+DEFAULT_CHECK_INTERVAL_MINUTES = 1440
+DEFAULT_CHECK_INTERVAL_JITTER = 0.1
+CONFIG_POLL_SECONDS = 60
+
+def run_scan(config, sites, history, bloom, http_cache, snapshot, app, show_all=False, no_email=False):
+    """Check sites, record what was seen, and report new jobs.
+
+    What the run cost, by stage and by site, is appended to the metrics
+    file (see metrics.py).
+    """
+    metrics = new_run_metrics()
+    # Send any emails left over from earlier runs while sites are checked
+    delivery = None if no_email else start_email_delivery(config, app["outbox_dir"])
+    
+    # Check all sites
+    all_jobs = []
+    failed_sites = []
+    slow_sites = []
+    print(f"{app['checking']} career sites:\n")
+    
+    results = iter_scan(config, sites, http_cache["sites"], seen_checker(history, bloom), snapshot)
+    # Pages in each listing when it was last read to the end, to report how
+    # many were skipped by stopping at known jobs
+    listing_pages = dict(history.execute(
+        "SELECT substr(key, 15), value FROM run_info WHERE key LIKE 'listing_pages|%'"
+    ))
+    listing_updates = {}
+    unread_sites = []
+    site_costs = []
+    with timed_stage(metrics, "scan"):
+        for site, result in results:
+            name = site['name']
+            print(f"  {app['checking']} {name}...", end=" ", flush=True)
+            if result['failure']:
+                print(f"❌ ({result['failure']['description']})")
+                failed_sites.append((name, site['url'], result['failure']))
+            else:
+                notes = [f"{len(result['jobs'])} matches"]
+                if result['pages'] > 1:
+                    notes.append(f"{result['pages']} pages")
+                if result['truncated']:
+                    max_bytes = site.get('max_page_bytes', config.get('max_page_bytes', DEFAULT_MAX_PAGE_BYTES))
+                    notes.append(f"page cut off after {max_bytes / 1e6:g} MB")
+                if result['stopped_early']:
+                    unread_sites.append(name)
+                    previous = listing_pages.get(name)
+                    if previous is not None:
+                        result['pages_skipped'] = max(0, int(previous) - result['pages'])
+                        notes.append(f"stopped at known jobs, {result['pages_skipped']} page(s) skipped")
+                    else:
+                        notes.append("stopped at known jobs")
+                elif result['pages']:
+                    listing_updates[name] = result['pages']
+                if result['stats'].get('over_budget'):
+                    notes.append("page too slow to read fully, quick scan used")
+                    slow_sites.append((name, site['url']))
+                print(f"✓ ({', '.join(notes)})")
+            all_jobs.extend(result['jobs'])
+            site_costs.append(site_metrics(site, result))
+    with history:
+        for name, pages in listing_updates.items():
+            set_run_info(history, f"listing_pages|{name}", pages)
+    
+    # Find new jobs
+    with timed_stage(metrics, "diff"):
+        job_ids = [job_id(job['site'], job['title'], job['url']) for job in all_jobs]
+        seen_set = find_seen_ids(history, job_ids, bloom)
+        new_jobs = []
+        
+        for job, jid in zip(all_jobs, job_ids):
+            if jid not in seen_set:
+                new_jobs.append(job)
+                seen_set.add(jid)
+                if bloom is not None:
+                    bloom_add(bloom, jid)
+    
+    # Save history
+    with timed_stage(metrics, "history_save"):
+        save_history(history, all_jobs, f"last_{app['run']}", unread_sites)
+        prune_history(
+            history,
+            config.get('history_retention_days', DEFAULT_HISTORY_RETENTION_DAYS),
+            config.get('history_max_jobs', DEFAULT_HISTORY_MAX_JOBS)
+        )
+        if bloom is not None:
+            # Pruned IDs stay in the filter; rebuild once it has taken in more
+            # IDs than it was sized for so the false positive rate holds
+            if bloom["count"] > bloom["capacity"]:
+                bloom.update(build_bloom(history, bloom["capacity"], bloom["fp_rate"]))
+            save_bloom(bloom, app["bloom_file"], history_generation(history))
+    with timed_stage(metrics, "cache_save"):
+        save_http_cache(http_cache, app["http_cache_file"], config['career_sites'])
+        save_snapshot(snapshot, config['career_sites'])
+    
+    # Format and display results
+    with timed_stage(metrics, "report"):
+        results = format_results(new_jobs, all_jobs, failed_sites, show_all, app, slow_sites)
+        print("\n" + results)
+        
+        # Save to file
+        app["output_file"].parent.mkdir(exist_ok=True)
+        with open(app["output_file"], 'w', encoding='utf-8') as f:
+            f.write(results)
+        print(f"\n📄 Results saved to: {app['output_file']}")
+        
+        # Create failed sites batch file
+        create_failed_sites_bat(failed_sites, app)
+    
+    # Send email if there are new jobs or failed sites
+    with timed_stage(metrics, "email"):
+        if (new_jobs or failed_sites) and not show_all and not no_email:
+            subject = f"🎯 {len(new_jobs)} New Job(s) Found!"
+            if failed_sites:
+                subject += f" + {len(failed_sites)} Site(s) Need Manual Check"
+            body = format_email_body(new_jobs, failed_sites, app)
+            send_email(config, subject, body, delivery)
+        
+        if delivery is not None:
+            finish_email_delivery(delivery)
+    
+    record = finish_run_metrics(metrics, site_costs, len(new_jobs))
+    write_run_metrics(record, app["metrics_file"], config.get('metrics_max_runs', DEFAULT_METRICS_MAX_RUNS))
+    stages = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in record['stages'].items())
+    print(f"\n⏱️  Run took {record['seconds']:.1f}s ({stages}) - details in {app['metrics_file'].name}")
+    
+    # Summary
+    if new_jobs and not show_all:
+        print(f"\n✨ {len(new_jobs)} new job(s) found! Check them out above.")
+    elif not new_jobs and not show_all:
+        print(f"\n😴 No new jobs since last {app['check']}.")
+    
+    if failed_sites:
+        print(f"\n⚠️  {len(failed_sites)} site(s) failed - run open_failed_sites.bat to check them")
+
+def site_interval(config, site):
+    """Seconds until a site's next check in daemon mode, with jitter."""
+    minutes = site.get(
+        'check_interval_minutes',
+        config.get('check_interval_minutes', DEFAULT_CHECK_INTERVAL_MINUTES)
+    )
+    jitter = config.get('check_interval_jitter', DEFAULT_CHECK_INTERVAL_JITTER)
+    return minutes * 60 * random.uniform(1 - jitter, 1 + jitter)
+
+def run_daemon(config, history, bloom, http_cache, snapshot, app, no_email=False):
+    """Keep running, checking each site whenever its own interval comes due.
+
+    History, caches, the HTTP session and compiled keyword matchers stay in
+    memory between checks. Edits to config.json are picked up automatically.
+    """
+    config_mtime = app["config_file"].stat().st_mtime
+    next_check = {}
+    print("Daemon mode: checking sites on their own schedules (Ctrl+C to stop)\n")
+    
+    while True:
+        now = time.monotonic()
+        due = [
+            site for site in config['career_sites']
+            if next_check.get(cache_key(site['name'], site['url']), now) <= now
+        ]
+        if due:
+            print(f"\n🕒 {datetime.now().strftime('%Y-%m-%d %H:%M')} - {len(due)} site(s) due")
+            run_scan(config, due, history, bloom, http_cache, snapshot, app, no_email=no_email)
+            for site in due:
+                next_check[cache_key(site['name'], site['url'])] = time.monotonic() + site_interval(config, site)
+        
+        wait = min(next_check.values(), default=now) - time.monotonic()
+        time.sleep(min(max(wait, 1), CONFIG_POLL_SECONDS))
+        
+        # Reload settings if config.json was edited
+        mtime = app["config_file"].stat().st_mtime
+        if mtime != config_mtime:
+            config_mtime = mtime
+            config = load_config(app["config_file"])
+            configure_host_limits(config)
+            bloom = open_bloom(config, history, app["bloom_file"], DEFAULT_HISTORY_MAX_JOBS)
+            http_cache = load_http_cache(app["http_cache_file"], config['keywords'],
+                                         config.get('negative_keywords', []))
+            current = {cache_key(site['name'], site['url']) for site in config['career_sites']}
+            next_check = {key: due_at for key, due_at in next_check.items() if key in current}
+            print("\n⚙️  Settings reloaded from config.json")
+
+def main(app):
+    """Main entry point."""
+    show_all = "--all" in sys.argv
+    reset = "--reset" in sys.argv
+    no_email = "--no-email" in sys.argv
+    daemon = "--daemon" in sys.argv
+    profile = "--profile" in sys.argv
+    
+    print(f"\n{app['banner']}")
+    print("-" * 40)
+    
+    # Load config
+    config = load_config(app["config_file"])
+    
+    # Load or reset history
+    history = load_history(app["history_db"], app["history_file"], f"last_{app['run']}")
+    if reset:
+        clear_history(history)
+        print("History cleared.\n")
+    else:
+        last_run = get_run_info(history, f"last_{app['run']}")
+        if last_run:
+            print(f"Last {app['run']}: {last_run}\n")
+    
+    configure_host_limits(config)
+    bloom = open_bloom(config, history, app["bloom_file"], DEFAULT_HISTORY_MAX_JOBS, reset)
+    http_cache = load_http_cache(app["http_cache_file"], config['keywords'], config.get('negative_keywords', []))
+    snapshot = load_snapshot(app["snapshot_dir"])
+    profiler = start_profiler() if profile else None
+    
+    try:
+        if daemon:
+            run_daemon(config, history, bloom, http_cache, snapshot, app, no_email)
+        else:
+            run_scan(config, config['career_sites'], history, bloom, http_cache, snapshot, app, show_all, no_email)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        history.close()
+        if profiler is not None:
+            finish_profile(profiler, app["profile_dir"])
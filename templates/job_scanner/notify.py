@@ -0,0 +1,108 @@
+"""
+Email notifications, queued in an outbox folder and sent in the background
+over one SMTP connection
+"""
+
+import email
+import queue
+import smtplib
+import threading
+from datetime import datetime
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+# Outgoing mail server (config: "smtp_host", "smtp_port", "smtp_starttls")
+DEFAULT_SMTP_HOST = 'smtp.gmail.com'
+DEFAULT_SMTP_PORT = 587
+
+def smtp_connect(config):
+    """Open an authenticated connection to the outgoing mail server."""
+    server = smtplib.SMTP(
+        config.get('smtp_host', DEFAULT_SMTP_HOST),
+        config.get('smtp_port', DEFAULT_SMTP_PORT),
+        timeout=30
+    )
+    try:
+        if config.get('smtp_starttls', True):
+            server.starttls()
+        if config.get('email_password'):
+            server.login(config['email'], config['email_password'])
+    except:
+        server.close()
+        raise
+    return server
+
+def email_delivery_worker(config, delivery):
+    """Send queued outbox messages over one reused SMTP connection.
+
+    After a failure the remaining messages are left in the outbox, to be
+    retried on the next run.
+    """
+    server = None
+    while True:
+        path = delivery["queue"].get()
+        if path is None:
+            break
+        if delivery["error"]:
+            delivery["kept"] += 1
+            continue
+        msg = email.message_from_bytes(path.read_bytes())
+        for attempt in range(2):
+            try:
+                if server is None:
+                    server = smtp_connect(config)
+                server.send_message(msg)
+                path.unlink()
+                delivery["sent"] += 1
+                break
+            except (smtplib.SMTPException, OSError) as e:
+                if server is not None:
+                    server.close()
+                server = None
+                # An idle connection dropped by the server is worth one reconnect
+                if attempt or not isinstance(e, smtplib.SMTPServerDisconnected):
+                    delivery["error"] = str(e)
+                    delivery["kept"] += 1
+                    break
+    if server is not None:
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+
+def start_email_delivery(config, outbox_dir):
+    """Start the background email sender, retrying anything left in the outbox."""
+    delivery = {"queue": queue.Queue(), "sent": 0, "kept": 0, "error": None, "outbox": outbox_dir}
+    for path in sorted(outbox_dir.glob('*.eml')):
+        delivery["queue"].put(path)
+    delivery["thread"] = threading.Thread(
+        target=email_delivery_worker, args=(config, delivery), daemon=True
+    )
+    delivery["thread"].start()
+    return delivery
+
+def send_email(config, subject, body, delivery):
+    """Queue an email notification in the outbox for the background sender."""
+    msg = MIMEMultipart()
+    msg['From'] = config['email']
+    msg['To'] = config['email']
+    msg['Subject'] = subject
+    
+    msg.attach(MIMEText(body, 'plain'))
+    
+    delivery["outbox"].mkdir(parents=True, exist_ok=True)
+    path = delivery["outbox"] / f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.eml"
+    path.write_bytes(msg.as_bytes())
+    delivery["queue"].put(path)
+
+def finish_email_delivery(delivery):
+    """Wait for the background sender to drain the outbox and report."""
+    delivery["queue"].put(None)
+    delivery["thread"].join()
+    if delivery["sent"] == 1:
+        print("✉️  Email notification sent!")
+    elif delivery["sent"]:
+        print(f"✉️  {delivery['sent']} email notifications sent!")
+    if delivery["error"]:
+        print(f"⚠ Failed to send email: {delivery['error']}")
+        print(f"  {delivery['kept']} message(s) kept in {delivery['outbox']} for the next run")
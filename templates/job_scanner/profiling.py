@@ -0,0 +1,161 @@
+"""
+The --profile mode: a sampling profiler that charges the run's time to each
+career site and to each function, to find the site (and the code) that
+makes a scan slow
+
+Sites are checked on worker threads, so every thread's stack is sampled a
+few hundred times a second and each sample is charged to the site whose
+check_site(), check_page() or test_site() call is on the stack. Time inside
+extract.py and matching.py is counted as parsing, as is time spent waiting
+in extract_page() for the extraction process pool ("extract_processes"),
+whose worker processes can't be sampled from here. The rest of a site's
+time is mostly waiting on its server.
+"""
+
+import csv
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# Seconds between samples
+PROFILE_INTERVAL_SECONDS = 0.005
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+SITE_FUNCTIONS = {"check_site", "check_page", "test_site"}
+PARSE_FILES = {"extract.py", "matching.py"}
+PARSE_FUNCTIONS = {"extract_page"}
+
+def start_profiler(interval=PROFILE_INTERVAL_SECONDS):
+    """Start sampling every thread from a background thread."""
+    profiler = {
+        "seconds": 0.0,
+        "sites": {},
+        "self": Counter(),
+        "total": Counter(),
+        "stop": threading.Event(),
+    }
+    profiler["thread"] = threading.Thread(target=sample_loop, args=(profiler, interval), daemon=True)
+    profiler["thread"].start()
+    return profiler
+
+def stop_profiler(profiler):
+    """Stop sampling."""
+    profiler["stop"].set()
+    profiler["thread"].join()
+
+def sample_loop(profiler, interval):
+    """Take samples until stopped, weighting each by the time since the last.
+
+    Weighting by elapsed time keeps the totals right when a long regex
+    holds the GIL and the sampler can't run in between.
+    """
+    me = threading.get_ident()
+    main = threading.main_thread().ident
+    last = time.perf_counter()
+    while not profiler["stop"].wait(interval):
+        now = time.perf_counter()
+        weight, last = now - last, now
+        profiler["seconds"] += weight
+        for ident, frame in sys._current_frames().items():
+            if ident != me:
+                add_sample(profiler, frame, weight, ident == main)
+
+def frame_function(frame):
+    """(function name, file name, first line) identifying a frame's function."""
+    code = frame.f_code
+    return code.co_name, os.path.basename(code.co_filename), code.co_firstlineno
+
+def frame_site(frame):
+    """Name of the site a stack is working on, or None."""
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name in SITE_FUNCTIONS and os.path.dirname(code.co_filename) == PACKAGE_DIR:
+            site = frame.f_locals.get('site')
+            return site.get('name') if isinstance(site, dict) else None
+        frame = frame.f_back
+    return None
+
+def add_sample(profiler, frame, weight, is_main):
+    """Charge one thread's sample to its functions and site.
+
+    Threads waiting on other threads are skipped, so a site's time is not
+    counted twice while it waits for its own page fetches, and worker
+    threads count only while checking a site (not while idle in the pool).
+    The exception is a wait in extract_page() for the extraction process
+    pool: that is the page being parsed, charged to extract_page() itself.
+    """
+    leaf = frame_function(frame)
+    site = frame_site(frame)
+    if site is None and not is_main:
+        return
+    functions = set()
+    parsing = False
+    pool_call = None
+    while frame is not None:
+        function = frame_function(frame)
+        functions.add(function)
+        code = frame.f_code
+        if os.path.dirname(code.co_filename) == PACKAGE_DIR:
+            if code.co_name in PARSE_FUNCTIONS and pool_call is None:
+                pool_call = function
+            parsing = parsing or pool_call is not None or os.path.basename(code.co_filename) in PARSE_FILES
+        frame = frame.f_back
+    if leaf[:2] == ("wait", "threading.py"):
+        if pool_call is None:
+            return
+        leaf = pool_call
+    profiler["self"][leaf] += weight
+    for function in functions:
+        profiler["total"][function] += weight
+    if site is not None:
+        entry = profiler["sites"].setdefault(site, {"seconds": 0.0, "parse_seconds": 0.0, "self": Counter()})
+        entry["seconds"] += weight
+        entry["self"][leaf] += weight
+        if parsing:
+            entry["parse_seconds"] += weight
+
+def describe(function):
+    """function_name (file.py:line) for a frame_function() key."""
+    name, filename, line = function
+    return f"{name} ({filename}:{line})"
+
+def write_profile_report(profiler, directory):
+    """Write sites.csv and functions.csv (slowest first) into directory.
+
+    Both open in a spreadsheet to sort by any column.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / "sites.csv", 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["site", "seconds", "parse_seconds", "other_seconds", "slowest_function",
+                         "slowest_function_seconds"])
+        for name, entry in sorted(profiler["sites"].items(), key=lambda item: -item[1]["seconds"]):
+            function, seconds = entry["self"].most_common(1)[0]
+            writer.writerow([name, round(entry["seconds"], 3), round(entry["parse_seconds"], 3),
+                             round(entry["seconds"] - entry["parse_seconds"], 3), describe(function),
+                             round(seconds, 3)])
+    with open(directory / "functions.csv", 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["function", "file", "line", "own_seconds", "total_seconds"])
+        for function, total in sorted(profiler["total"].items(), key=lambda item: -profiler["self"][item[0]]):
+            name, filename, line = function
+            writer.writerow([name, filename, line, round(profiler["self"][function], 3), round(total, 3)])
+
+def print_profile_summary(profiler, top=10):
+    """Print the slowest sites and functions."""
+    print(f"\n⏱️  Profile ({profiler['seconds']:.1f}s sampled)")
+    print("   Slowest sites (total / parsing):")
+    for name, entry in sorted(profiler["sites"].items(), key=lambda item: -item[1]["seconds"])[:top]:
+        print(f"     {entry['seconds']:7.2f}s {entry['parse_seconds']:7.2f}s  {name}")
+    print("   Slowest functions (own time):")
+    for function, seconds in profiler["self"].most_common(top):
+        print(f"     {seconds:7.2f}s  {describe(function)}")
+
+def finish_profile(profiler, directory):
+    """Stop the profiler, print its summary and write the full report."""
+    stop_profiler(profiler)
+    print_profile_summary(profiler)
+    write_profile_report(profiler, directory)
+    print(f"📄 Full profile saved to: {directory} (sites.csv, functions.csv)")
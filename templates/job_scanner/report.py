@@ -0,0 +1,149 @@
+"""
+Results text, notification emails and the failed-sites batch file
+"""
+
+from datetime import datetime
+
+def group_failed_sites(failed_sites):
+    """Split failed sites into broken and temporarily failing ones.
+
+    Returns (heading, sites) pairs, skipping empty groups.
+    """
+    broken = [entry for entry in failed_sites if not entry[2]['transient']]
+    flaky = [entry for entry in failed_sites if entry[2]['transient']]
+    groups = [
+        ("Broken (the link or site may have changed):", broken),
+        ("Temporary problems (still failing after retries, may be fine next run):", flaky),
+    ]
+    return [(heading, group) for heading, group in groups if group]
+
+def job_details(job):
+    """Location and posting date of a job, for the results, if known."""
+    details = []
+    if job.get('location'):
+        details.append(job['location'])
+    if job.get('date_posted'):
+        details.append(f"posted {job['date_posted'][:10]}")
+    return f" ({', '.join(details)})" if details else ""
+
+def format_email_body(new_jobs, failed_sites, app):
+    """Format email body with job listings."""
+    lines = []
+    lines.append(f"{app['name']} found {len(new_jobs)} new job(s)!")
+    lines.append(f"{app['checked']}: {datetime.now().strftime('%Y-%m-%d at %I:%M %p')}")
+    lines.append("=" * 60)
+    lines.append("")
+    
+    # Group by site
+    by_site = {}
+    for job in new_jobs:
+        site = job['site']
+        if site not in by_site:
+            by_site[site] = []
+        by_site[site].append(job)
+    
+    for site in sorted(by_site.keys()):
+        lines.append(f"{site}")
+        lines.append("-" * len(site))
+        for job in by_site[site]:
+            lines.append(f"• {job['title']}{job_details(job)}")
+            lines.append(f"  {job['url']}")
+        lines.append("")
+    
+    # Add failed sites, broken ones first
+    if failed_sites:
+        lines.append("=" * 60)
+        lines.append(f"⚠️  SITES TO CHECK MANUALLY ({len(failed_sites)}):")
+        lines.append("")
+        for heading, group in group_failed_sites(failed_sites):
+            lines.append(heading)
+            for name, url, failure in group:
+                lines.append(f"• {name} - {failure['description']}")
+                lines.append(f"  {url}")
+            lines.append("")
+    
+    lines.append("=" * 60)
+    lines.append("Good luck with your applications!")
+    
+    return "\n".join(lines)
+
+def format_results(new_jobs, all_jobs, failed_sites, show_all, app, slow_sites=()):
+    """Format results for display and file output.
+
+    slow_sites are (name, url) pairs of sites read with the quick scan
+    because their page took too long to read fully.
+    """
+    lines = []
+    lines.append("=" * 70)
+    lines.append(f"{app['results_heading']} - {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    lines.append("=" * 70)
+    
+    if show_all:
+        lines.append(f"\nShowing ALL {len(all_jobs)} matching jobs:\n")
+        jobs_to_show = all_jobs
+    else:
+        lines.append(f"\n🆕 {len(new_jobs)} NEW jobs found (out of {len(all_jobs)} total matches):\n")
+        jobs_to_show = new_jobs
+    
+    if not jobs_to_show:
+        lines.append("No matching jobs found.\n")
+    else:
+        by_site = {}
+        for job in jobs_to_show:
+            site = job['site']
+            if site not in by_site:
+                by_site[site] = []
+            by_site[site].append(job)
+        
+        for site in sorted(by_site.keys()):
+            lines.append(f"\n--- {site} ---")
+            for job in by_site[site]:
+                lines.append(f"  • {job['title']}{job_details(job)}")
+                lines.append(f"    {job['url']}")
+    
+    # Add failed sites section
+    if failed_sites:
+        lines.append("\n" + "=" * 70)
+        lines.append(f"\n⚠️  FAILED SITES - Manual Check Needed ({len(failed_sites)}):")
+        for heading, group in group_failed_sites(failed_sites):
+            lines.append(f"\n{heading}")
+            for name, url, failure in group:
+                lines.append(f"  • {name} - {failure['description']}")
+                lines.append(f"    {url}")
+    
+    # Sites whose jobs may be incomplete
+    if slow_sites:
+        lines.append("\n" + "=" * 70)
+        lines.append(f"\n⏱️  SLOW PAGES - Quick Scan Used, Some Jobs May Be Missing ({len(slow_sites)}):")
+        for name, url in slow_sites:
+            lines.append(f"  • {name}")
+            lines.append(f"    {url}")
+    
+    lines.append("\n" + "=" * 70)
+    return "\n".join(lines)
+
+def batch_echo_text(text):
+    """Escape text for an echo line in a batch file, so & | < > ^ print as-is."""
+    for ch in '^&|<>':
+        text = text.replace(ch, '^' + ch)
+    return text
+
+def create_failed_sites_bat(failed_sites, app):
+    """Create batch file to open failed sites."""
+    if not failed_sites:
+        content = f"@echo off\necho No failed sites from last {app['run']}.\npause"
+    else:
+        lines = ["@echo off", "echo Opening failed sites in your browser..."]
+        for heading, group in group_failed_sites(failed_sites):
+            lines.append("echo.")
+            lines.append(f"echo {batch_echo_text(heading)}")
+            for name, url, failure in group:
+                lines.append(f"echo   {batch_echo_text(name)} - {batch_echo_text(failure['description'])}")
+                lines.append(f'start "" "{url}"')
+        lines.append("echo Done!")
+        lines.append("pause")
+        content = "\n".join(lines)
+    
+    app["failed_sites_bat"].parent.mkdir(exist_ok=True)
+    with open(app["failed_sites_bat"], 'w') as f:
+        f.write(content)
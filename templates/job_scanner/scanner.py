@@ -0,0 +1,431 @@
+"""
+The scan itself: reads every career site in a config, page by page, through
+the shared fetch and extraction code, retrying temporary failures
+"""
+
+import heapq
+import json
+import multiprocessing
+import os
+import random
+import time
+import zlib
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from .ats import ATS_FETCHERS, api_jobs, ats_host, detect_ats
+from .cache import cache_key, content_hash
+from .extract import DEFAULT_EXTRACT_TIME_BUDGET_SECONDS, extract_compressed, extract_jobs, find_next_link
+from .fetch import (DEFAULT_FETCH_WORKERS, DEFAULT_MAX_PAGE_BYTES, MAX_RETRY_AFTER_SECONDS, NOT_MODIFIED,
+                    classify_failure, configure_host_limits, fetch_page, host_connections, host_delay,
+                    url_host)
+from .history import job_id
+from .snapshot import record_page, touch_page
+
+# Sites failing with a temporary problem (timeout, dropped connection, 429,
+# 5xx) are retried up to "fetch_retries" times, waiting about
+# "retry_backoff_seconds" doubled on each attempt, with random jitter
+DEFAULT_FETCH_RETRIES = 2
+DEFAULT_RETRY_BACKOFF_SECONDS = 2.0
+
+# Sites with more than one page of openings can set "pagination" in
+# config.json: {"next_link": true} follows the page's "next" link, and
+# {"param": "page", "start": 1, "step": 1} counts a URL parameter: the
+# configured URL is read as the first page, then the parameter is set to
+# "start" + "step", "start" + 2 * "step", ... ("start" defaults to 1 and
+# "step" to 1; use "param": "offset", "start": 0, "step": 20 for
+# offset-based listings).
+# At most "max_pages" pages are read (global, or per site inside
+# "pagination"). Counted pages are fetched a few at a time, up to the host's
+# connection limit. Reading stops at a page that repeats an earlier one or
+# holds only jobs seen on earlier runs. For listings sorted newest first, a
+# site can instead set "stop_after_known": N to stop as soon as N jobs in a
+# row were seen before, or 0 to always read every page. ATS API listings
+# (see ats.py) are always read to the end unless the site sets
+# "stop_after_known", since their order is not known.
+DEFAULT_MAX_PAGES = 10
+
+# Job extraction normally runs in the fetch threads. For configs with many
+# large pages, where parsing rather than the network is the bottleneck,
+# "extract_processes" hands it to a pool of worker processes instead: a
+# number of processes, or "auto" for one per available CPU core (0 keeps it
+# in the threads). Pages are sent to the workers zlib-compressed.
+DEFAULT_EXTRACT_PROCESSES = 0
+
+def load_config(path):
+    """Load configuration from config.json"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def page_url(url, param, value):
+    """Return url with a query parameter set to value."""
+    parts = urlparse(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != param]
+    query.append((param, str(value)))
+    return urlunparse(parts._replace(query=urlencode(query)))
+
+def extract_process_count(setting):
+    """Worker processes for an "extract_processes" setting."""
+    if setting == "auto":
+        try:
+            return len(os.sched_getaffinity(0))
+        except AttributeError:
+            return os.cpu_count() or 1
+    return max(0, int(setting or 0))
+
+def extract_page(html, url, name, keywords, negative_keywords, stats, budget, extract_pool=None):
+    """Extract a page's jobs in the fetch thread or, if given, the process pool.
+
+    The costs are added to stats (see add_stats()). If the pool has broken
+    (a worker process died), the page is extracted in the thread instead.
+    """
+    if extract_pool is not None:
+        body = zlib.compress(html.encode('utf-8'), 1)
+        try:
+            jobs, page_stats = extract_pool.submit(
+                extract_compressed, body, url, name, keywords, negative_keywords, budget
+            ).result()
+        except BrokenProcessPool:
+            pass
+        else:
+            add_stats(stats, page_stats)
+            return jobs
+    started = time.perf_counter()
+    jobs = extract_jobs(html, url, name, keywords, negative_keywords, stats, budget)
+    stats['extract_seconds'] = stats.get('extract_seconds', 0) + time.perf_counter() - started
+    return jobs
+
+def check_page(site, url, keywords, negative_keywords, http_cache=None, max_bytes=DEFAULT_MAX_PAGE_BYTES,
+               snapshot=None, extract_budget=DEFAULT_EXTRACT_TIME_BUDGET_SECONDS, extract_pool=None):
+    """Fetch one page of a career site and extract its matching jobs.
+
+    Returns a dict with the page's 'jobs', 'failure' (or None), whether it
+    was 'truncated', its 'content_hash', the 'next_url' it links to and
+    what it cost in 'stats' (see add_stats()).
+    When an http_cache dict is given, the page is fetched conditionally and
+    the previous job list is reused if the server reports the page unchanged
+    or the page body hashes the same as last time. A site's first page is
+    also stored in the fetch snapshot, if one is given (see snapshot.py).
+    Extraction gets extract_budget CPU seconds (or the site's own
+    "extract_time_budget_seconds"); a page over it is read with a cheaper
+    scan and counted in stats['over_budget'] (see extract_jobs()). With an
+    extract_pool (a ProcessPoolExecutor), extraction runs there.
+    """
+    name = site['name']
+    stats = {}
+    page = {'jobs': [], 'failure': None, 'truncated': False, 'content_hash': None, 'next_url': None,
+            'stats': stats}
+    key = cache_key(name, site['url'], url)
+    cached = http_cache.get(key) if http_cache is not None else None
+    first_page = snapshot is not None and url == site['url']
+    next_link = bool(site.get('pagination', {}).get('next_link'))
+    conditional = cached
+    if first_page and key not in snapshot["sites"]:
+        # Download the whole page once so the snapshot has a copy of it
+        conditional = None
+    if cached and cached.get('next_link', False) != next_link:
+        # The cached next_url was found (or not) under another "pagination"
+        # setting, so it can't be reused for an unchanged page
+        conditional = None
+    
+    html, validators, failure, page['truncated'] = fetch_page(
+        url, validators=conditional, max_bytes=site.get('max_page_bytes', max_bytes), stats=stats
+    )
+    if html is NOT_MODIFIED:
+        if first_page:
+            touch_page(snapshot, key)
+        page.update(jobs=cached['jobs'], content_hash=cached.get('content_hash'), next_url=cached.get('next_url'))
+        if cached.get('over_budget'):
+            stats['over_budget'] = 1
+        return page
+    if failure or not html:
+        page['failure'] = failure or classify_failure()
+        return page
+    
+    page['content_hash'] = content_hash(html, site.get('ignore_patterns'))
+    if first_page:
+        record_page(snapshot, key, url, html, page['content_hash'], stats, page['truncated'])
+    if next_link:
+        page['next_url'] = find_next_link(html, url)
+    if cached and cached.get('content_hash') == page['content_hash']:
+        page['jobs'] = cached['jobs']
+        if cached.get('over_budget'):
+            stats['over_budget'] = 1
+    else:
+        page['jobs'] = extract_page(html, url, name, keywords, negative_keywords, stats,
+                                    site.get('extract_time_budget_seconds', extract_budget), extract_pool)
+    if http_cache is not None:
+        http_cache[key] = dict(validators, content_hash=page['content_hash'], jobs=page['jobs'],
+                               next_url=page['next_url'], next_link=next_link,
+                               over_budget=bool(stats.get('over_budget')))
+    return page
+
+def add_stats(total, stats):
+    """Add one page's costs to a site's running totals.
+
+    Stats dicts hold the fetch 'seconds' and 'bytes' (see fetch_page()),
+    the 'candidates' checked against the keywords, the 'extract_seconds'
+    spent extracting jobs and how many pages went 'over_budget' doing so.
+    """
+    for name, value in stats.items():
+        total[name] = total.get(name, 0) + value
+
+def add_jobs(result, jobs, traversal, known_ids=None, stop_after=None):
+    """Add a page's jobs to a site result, returning True when it is time to stop.
+
+    traversal carries the job IDs taken so far and the current run of known
+    ones between pages. Without stop_after, the page-level rule applies: stop
+    after a page whose jobs were all seen before.
+    """
+    new = []
+    for job in jobs:
+        jid = job_id(job['site'], job['title'], job['url'])
+        if jid not in traversal['ids']:
+            traversal['ids'].add(jid)
+            new.append((jid, job))
+    if not new or not known_ids or stop_after == 0:
+        result['jobs'].extend(job for _, job in new)
+        return False
+    known = known_ids([jid for jid, _ in new])
+    if stop_after is None:
+        result['jobs'].extend(job for _, job in new)
+        return len(known) == len(new)
+    for jid, job in new:
+        result['jobs'].append(job)
+        traversal['known_run'] = traversal['known_run'] + 1 if jid in known else 0
+        if traversal['known_run'] >= stop_after:
+            return True
+    return False
+
+def check_site(site, keywords, negative_keywords, http_cache=None, max_bytes=DEFAULT_MAX_PAGE_BYTES,
+               known_ids=None, max_pages=DEFAULT_MAX_PAGES, snapshot=None,
+               extract_budget=DEFAULT_EXTRACT_TIME_BUDGET_SECONDS, extract_pool=None):
+    """Check a single career site (its config.json entry) for matching jobs.
+
+    Returns a dict with the 'jobs' found, the 'failure' if the site could
+    not be fetched (else None), whether any page was 'truncated' at
+    max_bytes, how many 'pages' were read, whether reading
+    'stopped_early' at known jobs and the 'stats' of all pages together. Sites on a known applicant tracking
+    system are read through its JSON API, falling back to the page itself if
+    the API call fails for good (see detect_ats()).
+
+    Sites with "pagination" are read page by page (see check_page()); a
+    failed page past the first ends the listing. known_ids, if given, is a
+    function returning which of a list of job IDs were seen before, and
+    ends the traversal at known jobs (see add_jobs()); API listings only
+    stop early for sites with "stop_after_known".
+    """
+    name, url = site['name'], site['url']
+    stop_after = site.get('stop_after_known')
+    result = {'jobs': [], 'failure': None, 'truncated': False, 'pages': 0, 'stopped_early': False, 'stats': {}}
+    traversal = {'ids': set(), 'known_run': 0}
+    ats_name, match = detect_ats(url, site.get('ats'))
+    if ats_name:
+        def on_page(postings, more):
+            result['pages'] += 1
+            started = time.perf_counter()
+            jobs = api_jobs(postings, name, keywords, negative_keywords)
+            add_stats(result['stats'], {'candidates': len(postings),
+                                        'extract_seconds': time.perf_counter() - started})
+            stop = add_jobs(result, jobs, traversal, known_ids if stop_after is not None else None, stop_after)
+            result['stopped_early'] = stop and more
+            return stop
+        postings, failure = ATS_FETCHERS[ats_name](match, on_page, result['stats'])
+        if postings is not None:
+            return result
+        if failure['transient']:
+            result['failure'] = failure
+            return result
+        result.update(jobs=[], pages=0, stopped_early=False)
+        traversal = {'ids': set(), 'known_run': 0}
+    
+    pagination = site.get('pagination') or {}
+    max_pages = max(1, pagination.get('max_pages', max_pages)) if pagination else 1
+    if 'param' in pagination:
+        start, step = pagination.get('start', 1), pagination.get('step', 1)
+        urls = [url] + [page_url(url, pagination['param'], start + n * step) for n in range(1, max_pages)]
+        batch_size = host_connections()
+    else:
+        urls = [url]
+        batch_size = 1
+    
+    hashes = set()
+    visited = set()
+    with ThreadPoolExecutor(max_workers=batch_size) as executor:
+        while urls and result['pages'] < max_pages:
+            batch, urls = urls[:batch_size], urls[batch_size:]
+            pages = executor.map(
+                lambda batch_url: check_page(site, batch_url, keywords, negative_keywords, http_cache, max_bytes,
+                                             snapshot, extract_budget, extract_pool),
+                batch
+            )
+            for position, (fetched_url, page) in enumerate(zip(batch, pages)):
+                add_stats(result['stats'], page['stats'])
+                if page['failure']:
+                    if not result['pages']:
+                        result['failure'] = page['failure']
+                    return result
+                if page['content_hash'] in hashes:
+                    return result
+                hashes.add(page['content_hash'])
+                visited.add(fetched_url)
+                result['pages'] += 1
+                result['truncated'] = result['truncated'] or page['truncated']
+                if result['pages'] >= max_pages:
+                    add_jobs(result, page['jobs'], traversal)
+                    return result
+                if add_jobs(result, page['jobs'], traversal, known_ids, stop_after):
+                    result['stopped_early'] = bool(urls or position < len(batch) - 1 or page['next_url'])
+                    return result
+                if page['next_url'] and page['next_url'] not in visited:
+                    urls.append(page['next_url'])
+    return result
+
+def site_host(site):
+    """The host a site's first request goes to: its ATS API's, or its page's."""
+    ats_name, match = detect_ats(site['url'], site.get('ats'))
+    return ats_host(ats_name, match) if ats_name else url_host(site['url'])
+
+def interleave_by_host(sites):
+    """Return site indexes ordered round-robin across hosts.
+
+    Workers then start on as many different hosts as possible instead of
+    queuing up behind one host's rate limit.
+    """
+    by_host = {}
+    for index, site in enumerate(sites):
+        by_host.setdefault(site_host(site), []).append(index)
+    order = []
+    queues = list(by_host.values())
+    for round_number in range(max((len(q) for q in queues), default=0)):
+        order.extend(q[round_number] for q in queues if round_number < len(q))
+    return order
+
+def retry_delay(failure, attempt, backoff):
+    """Seconds to wait before retrying a failed site, or None to give up."""
+    if not failure['transient']:
+        return None
+    delay = backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+    if failure['retry_after'] is not None:
+        if failure['retry_after'] > MAX_RETRY_AFTER_SECONDS:
+            return None
+        delay = max(delay, failure['retry_after'])
+    return delay
+
+def check_all_sites(sites, keywords, negative_keywords, workers=DEFAULT_FETCH_WORKERS, http_cache=None,
+                    retries=DEFAULT_FETCH_RETRIES, backoff=DEFAULT_RETRY_BACKOFF_SECONDS,
+                    max_bytes=DEFAULT_MAX_PAGE_BYTES, known_ids=None, max_pages=DEFAULT_MAX_PAGES,
+                    snapshot=None, extract_budget=DEFAULT_EXTRACT_TIME_BUDGET_SECONDS,
+                    extract_processes=DEFAULT_EXTRACT_PROCESSES):
+    """Check all career sites concurrently, yielding results in config order.
+
+    Sites that fail with a temporary problem go back in the queue with a
+    backoff delay rather than sleeping in a worker, so other sites keep
+    being fetched in the meantime. So do sites whose host is paused or out
+    of rate limit tokens (see host_delay()), without using up an attempt,
+    and at most host_connections() sites per host are checked at once.
+    Each result records how many 'attempts' it took. With extract_processes, pages are parsed in a pool of that many
+    worker processes, started for this scan.
+    """
+    workers = max(1, workers)
+    # (time the site may start, submission order, site index, attempt)
+    pending = [(0, order, index, 0) for order, index in enumerate(interleave_by_host(sites))]
+    hosts = [site_host(site) for site in sites]
+    host_running = Counter()
+    # Sites waiting for another site on their host to finish, by host
+    blocked = {}
+    running = {}
+    results = {}
+    next_to_yield = 0
+    
+    # Workers are spawned rather than forked, since the fetch threads may be
+    # holding locks when the pool starts its processes
+    extract_pool = None
+    if extract_processes:
+        extract_pool = ProcessPoolExecutor(extract_processes, mp_context=multiprocessing.get_context("spawn"))
+    with extract_pool or nullcontext(), ThreadPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            now = time.monotonic()
+            while pending and pending[0][0] <= now and len(running) < workers:
+                _, order, index, attempt = heapq.heappop(pending)
+                host = hosts[index]
+                if host_running[host] >= host_connections():
+                    blocked.setdefault(host, []).append((order, index, attempt))
+                    continue
+                wait_seconds = host_delay(host)
+                if 0 < wait_seconds <= MAX_RETRY_AFTER_SECONDS:
+                    heapq.heappush(pending, (now + wait_seconds, order, index, attempt))
+                    continue
+                site = sites[index]
+                host_running[host] += 1
+                future = executor.submit(
+                    check_site, site, keywords, negative_keywords, http_cache, max_bytes, known_ids, max_pages,
+                    snapshot, extract_budget, extract_pool
+                )
+                running[future] = (order, index, attempt)
+            
+            timeout = None
+            if pending and len(running) < workers:
+                timeout = max(0, pending[0][0] - now)
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                order, index, attempt = running.pop(future)
+                host = hosts[index]
+                host_running[host] -= 1
+                for entry in blocked.pop(host, []):
+                    heapq.heappush(pending, (time.monotonic(), *entry))
+                result = future.result()
+                failure = result['failure']
+                if failure and failure['kind'] == 'paused' and failure['retry_after'] <= MAX_RETRY_AFTER_SECONDS:
+                    # Not tried at all: its host was paused by another site's Retry-After
+                    heapq.heappush(pending, (time.monotonic() + failure['retry_after'], order, index, attempt))
+                    continue
+                delay = None
+                if failure and attempt < retries:
+                    delay = retry_delay(failure, attempt, backoff)
+                if delay is None:
+                    result['attempts'] = attempt + 1
+                    results[index] = result
+                else:
+                    heapq.heappush(pending, (time.monotonic() + delay, order, index, attempt + 1))
+            
+            while next_to_yield in results:
+                yield sites[next_to_yield], results.pop(next_to_yield)
+                next_to_yield += 1
+
+def iter_scan(config, sites=None, http_cache=None, known_ids=None, snapshot=None):
+    """Check the config's career sites, yielding (site, result) in config order.
+
+    sites defaults to every entry in config['career_sites']. Results are the
+    dicts returned by check_site(), yielded as soon as each site (and every
+    site before it) is done. See check_page() for http_cache and snapshot,
+    and check_site() for known_ids.
+    """
+    return check_all_sites(
+        config['career_sites'] if sites is None else sites,
+        config['keywords'],
+        config.get('negative_keywords', []),
+        config.get('fetch_workers', DEFAULT_FETCH_WORKERS),
+        http_cache,
+        config.get('fetch_retries', DEFAULT_FETCH_RETRIES),
+        config.get('retry_backoff_seconds', DEFAULT_RETRY_BACKOFF_SECONDS),
+        config.get('max_page_bytes', DEFAULT_MAX_PAGE_BYTES),
+        known_ids,
+        config.get('max_pages', DEFAULT_MAX_PAGES),
+        snapshot,
+        config.get('extract_time_budget_seconds', DEFAULT_EXTRACT_TIME_BUDGET_SECONDS),
+        extract_process_count(config.get('extract_processes', DEFAULT_EXTRACT_PROCESSES))
+    )
+
+def scan(config, sites=None, http_cache=None, known_ids=None, snapshot=None):
+    """Scan career sites once and return a list of (site, result) pairs.
+
+    config is a loaded config.json dict. This is the entry point for other
+    tools: nothing is written to disk and no history is consulted unless
+    known_ids is given.
+    """
+    configure_host_limits(config)
+    return list(iter_scan(config, sites, http_cache, known_ids, snapshot))
@@ -0,0 +1,95 @@
+"""
+Fetch snapshot: the first page of every scraped career site as the monitor
+last downloaded it, so the health check can reuse recent fetches instead of
+downloading every site again
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+from .cache import cache_key
+
+# The health check reuses a site's snapshot if the monitor fetched it at
+# most this many minutes ago (config: "snapshot_max_age_minutes", 0 to
+# always re-download)
+DEFAULT_SNAPSHOT_MAX_AGE_MINUTES = 60
+
+SNAPSHOT_INDEX = "index.json"
+
+def load_snapshot(snapshot_dir):
+    """Load the snapshot index, or start an empty one."""
+    snapshot = {"dir": snapshot_dir, "sites": {}, "lock": threading.Lock()}
+    try:
+        with open(snapshot_dir / SNAPSHOT_INDEX, 'r') as f:
+            snapshot["sites"] = json.load(f)
+    except (OSError, ValueError):
+        pass
+    return snapshot
+
+def page_file(snapshot, key):
+    """Where a site's page body is stored."""
+    return snapshot["dir"] / (hashlib.sha1(key.encode('utf-8')).hexdigest()[:20] + ".html.gz")
+
+def write_atomic(path, data):
+    """Write a file so a reader never sees it half written."""
+    temp = path.with_name(path.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+    temp.write_bytes(data)
+    temp.replace(path)
+
+def record_page(snapshot, key, url, html, page_hash, stats, truncated=False):
+    """Store a freshly fetched first page and how long it took.
+
+    The body is only rewritten when its content hash changed.
+    """
+    entry = {
+        "url": url,
+        "fetched_at": datetime.now().isoformat(timespec='seconds'),
+        "seconds": round(stats.get('seconds', 0), 3),
+        "bytes": stats.get('bytes', 0),
+        "truncated": truncated,
+        "content_hash": page_hash,
+    }
+    with snapshot["lock"]:
+        previous = snapshot["sites"].get(key)
+    path = page_file(snapshot, key)
+    if not previous or previous.get("content_hash") != page_hash or not path.exists():
+        snapshot["dir"].mkdir(parents=True, exist_ok=True)
+        write_atomic(path, gzip.compress(html.encode('utf-8'), compresslevel=1))
+    with snapshot["lock"]:
+        snapshot["sites"][key] = entry
+
+def touch_page(snapshot, key):
+    """Mark a stored page as current after the server answered 304."""
+    with snapshot["lock"]:
+        entry = snapshot["sites"].get(key)
+        if entry:
+            entry["fetched_at"] = datetime.now().isoformat(timespec='seconds')
+
+def save_snapshot(snapshot, career_sites):
+    """Write the snapshot index, dropping sites no longer in the config."""
+    current = {cache_key(site['name'], site['url']) for site in career_sites}
+    with snapshot["lock"]:
+        for key in [key for key in snapshot["sites"] if key not in current]:
+            del snapshot["sites"][key]
+            page_file(snapshot, key).unlink(missing_ok=True)
+        data = json.dumps(snapshot["sites"]).encode('utf-8')
+    snapshot["dir"].mkdir(parents=True, exist_ok=True)
+    write_atomic(snapshot["dir"] / SNAPSHOT_INDEX, data)
+
+def snapshot_page(snapshot, key, max_age_minutes):
+    """Return (html, entry) for a stored page fetched recently enough, else None."""
+    entry = snapshot["sites"].get(key)
+    if not entry or max_age_minutes <= 0:
+        return None
+    age = datetime.now() - datetime.fromisoformat(entry["fetched_at"])
+    if age.total_seconds() > max_age_minutes * 60:
+        return None
+    try:
+        html = gzip.decompress(page_file(snapshot, key).read_bytes()).decode('utf-8')
+    except (OSError, EOFError, UnicodeDecodeError):
+        return None
+    return html, entry